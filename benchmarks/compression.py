@@ -0,0 +1,90 @@
+"""CPU time versus bytes saved by response compression.
+
+Every payload is compressed with each available encoding at several
+levels, reporting the time per body and the share of bytes saved. The
+last section shows the longest event loop stall while a large body is
+compressed inline and in the thread pool, which is what `offload_size`
+of `web.compression` decides.
+
+    PYTHONPATH=. python benchmarks/compression.py
+"""
+
+import asyncio
+import json
+from time import perf_counter
+
+from aiohttp.test_utils import make_mocked_request
+from aiohttp.web import Response
+
+from moduleweb import web
+from moduleweb.web.compress import compress_body, brotli_compress
+
+REPEAT = 20
+LEVELS = (1, 6, 9)
+
+
+def api_page() -> bytes:
+    return json.dumps([
+        {"id": index, "name": f"user {index}", "email": f"user{index}@example.com",
+         "active": index % 3 != 0, "tags": ["a", "b", "c"]}
+        for index in range(200)
+    ]).encode()
+
+
+def html_page() -> bytes:
+    rows = "".join(
+        f"<tr><td>{index}</td><td><a href='/items/{index}'>Item {index}</a></td><td>{index * 3.5}</td></tr>"
+        for index in range(2000)
+    )
+    return f"<html><body><table>{rows}</table></body></html>".encode()
+
+
+def measure(body: bytes, encoding: str, level: int) -> tuple:
+    start = perf_counter()
+    for _ in range(REPEAT):
+        compressed = compress_body(body, encoding, level)
+    elapsed = (perf_counter() - start) / REPEAT
+    return elapsed * 1000, 1 - len(compressed) / len(body)
+
+
+async def stall(offload_size: int, body: bytes) -> float:
+    app = web.App(compression=web.compression(offload_size=offload_size))
+    request = make_mocked_request("GET", "/", headers={"Accept-Encoding": "gzip"}, app=app)
+    longest, running = 0.0, True
+
+    async def ticker() -> None:
+        nonlocal longest
+        last = perf_counter()
+        while running:
+            await asyncio.sleep(0.001)
+            now = perf_counter()
+            longest, last = max(longest, now - last), now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    for _ in range(5):
+        await app.compression.apply(request, Response(body=body, content_type="text/html"))
+    running = False
+    await task
+    await app.executor.close()
+    return longest * 1000
+
+
+async def main() -> None:
+    encodings = ["gzip", "deflate"] + (["br"] if brotli_compress is not None else [])
+    print(f"{'payload':<16} {'encoding':<8} {'level':>5} {'ms':>7} {'saved':>6}")
+    for kind, body in (("json", api_page()), ("html", html_page())):
+        name = f"{kind} {len(body) // 1024} KB"
+        for encoding in encodings:
+            for level in LEVELS:
+                elapsed, saved = measure(body, encoding, level)
+                print(f"{name:<16} {encoding:<8} {level:>5} {elapsed:>7.2f} {saved:>6.1%}")
+
+    body = html_page() * 10
+    print(f"\nlongest event loop stall compressing {len(body) // 1024} KB bodies")
+    print(f"inline     {await stall(len(body) + 1, body):>7.2f} ms")
+    print(f"offloaded  {await stall(65536, body):>7.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
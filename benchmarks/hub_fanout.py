@@ -0,0 +1,84 @@
+"""Broadcast time to many WebSocket clients with and without `Hub`.
+
+10 000 simulated clients are connected in the same process. A sent frame
+takes a loop iteration, like a write that waits for the transport buffer,
+and every hundredth client is slow and takes a millisecond. The serial
+loop is what applications write by hand: it encodes the message for
+every client and awaits `send_str` one client at a time. The hub encodes
+the message once and every client sends from its own queue concurrently.
+
+    PYTHONPATH=. python benchmarks/hub_fanout.py
+"""
+
+import asyncio
+import json
+from time import perf_counter
+
+from moduleweb import web
+
+CLIENTS = 10000
+MESSAGES = 20
+MESSAGE = {"type": "price", "symbol": "ABC", "bid": 101.25, "ask": 101.5, "levels": list(range(20))}
+
+
+class FakeSocket:
+    def __init__(self, index: int) -> None:
+        self.delay = 0.001 if index % 100 == 0 else 0
+        self.received = 0
+        self.done = None
+
+    async def _write(self) -> None:
+        await asyncio.sleep(self.delay)
+        self.received += 1
+        if self.received == MESSAGES and self.done is not None:
+            self.done.set_result(None)
+
+    async def send_str(self, data: str) -> None:
+        data.encode()
+        await self._write()
+
+    async def send_frame(self, message: bytes, opcode) -> None:
+        await self._write()
+
+
+async def serial() -> float:
+    sockets = [FakeSocket(index) for index in range(CLIENTS)]
+    start = perf_counter()
+    for _ in range(MESSAGES):
+        for socket in sockets:
+            await socket.send_str(json.dumps(MESSAGE))
+    return perf_counter() - start
+
+
+async def hub() -> float:
+    app = web.App()
+    router = web.Router()
+    prices = router.hub("prices", queue_size=MESSAGES)
+    app.add([router])
+
+    sockets = [FakeSocket(index) for index in range(CLIENTS)]
+    clients = [prices.connect(socket, ["ABC"]) for socket in sockets]
+    for client, socket in zip(clients, sockets):
+        socket.done = asyncio.get_running_loop().create_future()
+        await client.__aenter__()
+
+    start = perf_counter()
+    for _ in range(MESSAGES):
+        prices.publish("ABC", MESSAGE)
+    await asyncio.gather(*[socket.done for socket in sockets])
+    elapsed = perf_counter() - start
+
+    for client in clients:
+        await client.__aexit__(None, None, None)
+    return elapsed
+
+
+async def main() -> None:
+    print(f"{CLIENTS} clients, {MESSAGES} messages")
+    for name, measure in (("serial", serial), ("hub", hub)):
+        elapsed = await measure()
+        print(f"{name:<7} {elapsed:>7.3f} s {CLIENTS * MESSAGES / elapsed:>10.0f} frames/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
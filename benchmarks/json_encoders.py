@@ -0,0 +1,61 @@
+"""Serialization time of the JSON backends available to `web.json`.
+
+The payloads imitate typical API answers: a page of flat records, a deeply
+nested document and a list of records with datetimes, decimals and UUIDs
+that go through the `default` hooks of the encoder.
+
+    PYTHONPATH=. python benchmarks/json_encoders.py
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from timeit import repeat
+from uuid import uuid4
+
+from moduleweb.web.encoder import Encoder, BACKENDS
+
+NUMBER = 200
+
+
+def flat_page() -> list:
+    return [
+        {"id": index, "name": f"user {index}", "email": f"user{index}@example.com",
+         "active": index % 3 != 0, "score": index * 1.5, "tags": ["a", "b", "c"]}
+        for index in range(500)
+    ]
+
+
+def nested_document() -> dict:
+    node = {"value": "leaf", "items": list(range(20))}
+    for depth in range(30):
+        node = {"depth": depth, "child": node, "siblings": [{"n": n} for n in range(10)]}
+    return node
+
+
+def typed_records() -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        {"id": uuid4(), "created": now, "price": Decimal("19.99"), "labels": {"x", "y"}}
+        for _ in range(500)
+    ]
+
+
+PAYLOADS = {
+    "flat page": flat_page(),
+    "nested document": nested_document(),
+    "typed records": typed_records()
+}
+
+
+def main() -> None:
+    print(f"{'payload':<18} {'backend':<8} {'ms/op':>8} {'bytes':>8}")
+    for title, payload in PAYLOADS.items():
+        for backend in BACKENDS:
+            encoder = Encoder(backend)
+            size = len(encoder.encode(payload))
+            best = min(repeat(lambda: encoder.encode(payload), number=NUMBER, repeat=5))
+            print(f"{title:<18} {backend:<8} {best / NUMBER * 1e3:>8.3f} {size:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Time spent in `App.add` with eager and lazy modules.
+
+A temporary application package with many modules is generated, and every
+view imports a dependency that takes a few milliseconds to load, like
+the client libraries real modules pull in. Eager modules import all of
+them in `App.add`, while lazy ones only record their prefixes.
+
+    PYTHONPATH=. python benchmarks/lazy_startup.py
+"""
+
+import sys
+from importlib import invalidate_caches
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from moduleweb import web
+
+MODULE_COUNTS = (10, 50, 200)
+
+HEAVY = """
+TABLE = {{index: str(index) * 8 for index in range({size})}}
+"""
+
+VIEW = """
+from moduleweb import web
+from . import heavy
+
+router = web.Router()
+
+
+@router.get("/{name}/")
+async def index(request):
+    return web.text(str(len(heavy.TABLE)))
+"""
+
+
+def generate(root: Path, package: str, modules: int) -> None:
+    (root / package).mkdir()
+    (root / package / "__init__.py").write_text("")
+    for index in range(modules):
+        name = f"m{index}"
+        directory = root / package / name
+        directory.mkdir()
+        (directory / "__init__.py").write_text("")
+        (directory / "heavy.py").write_text(HEAVY.format(size=20000))
+        (directory / "view.py").write_text(VIEW.replace("{name}", name))
+
+
+def measure(package: str, modules: int, lazy: bool) -> float:
+    app = web.App(f"{package}.main")
+    start = perf_counter()
+    app.add([
+        web.module(f"m{index}", lazy=[f"/m{index}/"] if lazy else None)
+        for index in range(modules)
+    ])
+    return perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'modules':>8} {'eager, ms':>10} {'lazy, ms':>10}")
+    with TemporaryDirectory() as directory:
+        sys.path.insert(0, directory)
+        for modules in MODULE_COUNTS:
+            eager_package, lazy_package = f"eager{modules}", f"lazy{modules}"
+            generate(Path(directory), eager_package, modules)
+            generate(Path(directory), lazy_package, modules)
+            invalidate_caches()
+
+            eager = measure(eager_package, modules, lazy=False)
+            lazy = measure(lazy_package, modules, lazy=True)
+            print(f"{modules:>8} {eager * 1e3:>10.1f} {lazy * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Per-request overhead of the latency instrumentation.
+
+The same application is served on localhost and queried sequentially with
+instrumentation disabled, with 10% of requests sampled and with every
+request sampled. The write phase of a sampled request ends when aiohttp
+has sent the response, so the comparison has to go through a real
+connection rather than a mocked request. The cases are measured in
+interleaved rounds so that drift of the machine affects all of them alike.
+
+    PYTHONPATH=. python benchmarks/metrics_overhead.py
+"""
+
+import asyncio
+from time import perf_counter
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from moduleweb import web
+
+REQUESTS = 3000
+SAMPLING = (0.0, 0.1, 1.0)
+ROUNDS = 5
+
+
+def build_app(sampling: float) -> web.App:
+    app = web.App(sampling=sampling)
+    router = web.Router(scoped=True)
+
+    @router.middleware
+    async def passthrough(request, handler):
+        return await handler(request)
+
+    @router.get("/item")
+    async def item(request):
+        return web.json({"id": 1, "name": "item"})
+
+    app.add([router])
+    return app
+
+
+async def measure(sampling: float) -> float:
+    async with TestClient(TestServer(build_app(sampling))) as client:
+        for _ in range(100):
+            await (await client.get("/item")).read()
+
+        start = perf_counter()
+        for _ in range(REQUESTS):
+            await (await client.get("/item")).read()
+        return (perf_counter() - start) / REQUESTS * 1e6
+
+
+async def main() -> None:
+    results = {sampling: float("inf") for sampling in SAMPLING}
+    for _ in range(ROUNDS):
+        for sampling in SAMPLING:
+            results[sampling] = min(results[sampling], await measure(sampling))
+    print(f"{'sampling':>9} {'us/request':>11} {'overhead':>9}")
+    for sampling, elapsed in results.items():
+        print(f"{sampling:>9.1f} {elapsed:>11.2f} {elapsed - results[0.0]:>+9.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""Memory allocated and time spent per simple response.
+
+Every case imitates a handler returning a response that is converted into
+an aiohttp response, the way `response_processor` does it. All objects are
+kept alive while tracemalloc is running, so the traced size divided by the
+number of responses is the memory allocated for each of them. Constant
+responses declared once with `text.const`/`json.const` are compared with
+the regular ones.
+
+    PYTHONPATH=. python benchmarks/response_allocations.py
+"""
+
+import asyncio
+import tracemalloc
+from time import perf_counter
+
+from aiohttp.test_utils import make_mocked_request
+from aiohttp.web import Response
+
+from moduleweb import web
+
+RESPONSES = 10000
+
+OK_TEXT = web.text.const("ok")
+OK_JSON = web.json.const({"status": "ok"})
+
+CASES = {
+    "aiohttp": lambda: Response(text="ok"),
+    "text": lambda: web.text("ok"),
+    "text.const": lambda: OK_TEXT,
+    "json": lambda: web.json({"status": "ok"}),
+    "json.const": lambda: OK_JSON
+}
+
+
+async def convert(request, handler):
+    response = handler()
+    if isinstance(response, Response):
+        return response, response
+    return response, await response(request)
+
+
+async def allocated(request, handler) -> float:
+    await convert(request, handler)
+    kept = []
+    tracemalloc.start()
+    for _ in range(RESPONSES):
+        kept.append(await convert(request, handler))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / RESPONSES
+
+
+async def elapsed(request, handler) -> float:
+    start = perf_counter()
+    for _ in range(RESPONSES):
+        await convert(request, handler)
+    return (perf_counter() - start) / RESPONSES * 1e6
+
+
+async def main() -> None:
+    app = web.App()
+    request = make_mocked_request("GET", "/", app=app)
+
+    print(f"{'response':<13} {'bytes':>7} {'us':>6}")
+    for name, handler in CASES.items():
+        size = await allocated(request, handler)
+        time = await elapsed(request, handler)
+        print(f"{name:<13} {size:>7.0f} {time:>6.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""Route resolution time versus the number of routes.
+
+Every section contributes a plain route, a dynamic route and a nested
+dynamic route. The last registered routes are resolved by a linear walk
+over all resources, as aiohttp did before 3.9, and by the dispatcher of
+the installed aiohttp, which indexes resources by their path prefixes.
+
+    PYTHONPATH=. python benchmarks/route_resolution.py
+"""
+
+import asyncio
+from time import perf_counter
+
+from aiohttp.test_utils import make_mocked_request
+
+from moduleweb import web
+
+RESOLUTIONS = 2000
+ROUTE_COUNTS = (100, 1000, 3000)
+
+
+def build_app(routes: int) -> web.App:
+    app = web.App()
+    router = web.Router()
+    for index in range(routes // 3):
+        router.lib(f"/section{index}/about", handler)
+        router.lib(f"/section{index}/items/{{id}}", handler)
+        router.lib(f"/section{index}/items/{{id}}/comments/{{comment:\\d+}}", handler)
+    app.add([router])
+    app.freeze()
+    return app
+
+
+async def handler(request):
+    return web.text("ok")
+
+
+async def linear_resolve(app, request):
+    for resource in app.router._resources:
+        match_dict, _ = await resource.resolve(request)
+        if match_dict is not None:
+            return match_dict
+
+
+async def measure(routes: int, linear: bool = False) -> float:
+    app = build_app(routes)
+    last = routes // 3 - 1
+    requests = [
+        make_mocked_request("GET", path, app=app)
+        for path in (f"/section{last}/about", f"/section{last}/items/7", f"/section{last}/items/7/comments/3")
+    ]
+
+    start = perf_counter()
+    for _ in range(RESOLUTIONS):
+        for request in requests:
+            if linear:
+                await linear_resolve(app, request)
+            else:
+                await app.router.resolve(request)
+    return (perf_counter() - start) / RESOLUTIONS / len(requests) * 1e6
+
+
+async def main() -> None:
+    print(f"{'routes':>7} {'linear, us':>11} {'aiohttp, us':>12}")
+    for routes in ROUTE_COUNTS:
+        linear = await measure(routes, linear=True)
+        default = await measure(routes)
+        print(f"{routes:>7} {linear:>11.2f} {default:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
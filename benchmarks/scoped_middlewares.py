@@ -0,0 +1,62 @@
+"""Per-request overhead of module middlewares versus the number of modules.
+
+Every module gets one pass-through middleware and one route. In the global
+mode each request walks the middlewares of every module, while in the scoped
+mode it only walks the middlewares of the module that owns the route.
+
+    PYTHONPATH=. python benchmarks/scoped_middlewares.py
+"""
+
+import asyncio
+from time import perf_counter
+
+from aiohttp.test_utils import make_mocked_request
+
+from moduleweb import web
+
+REQUESTS = 2000
+MODULE_COUNTS = (1, 10, 40, 100)
+
+
+def build_app(modules: int, scoped: bool) -> web.App:
+    app = web.App()
+    routers = []
+    for index in range(modules):
+        router = web.Router(scoped=scoped)
+
+        @router.middleware
+        async def passthrough(request, handler):
+            return await handler(request)
+
+        @router.get(f"/m{index}")
+        async def view(request):
+            return web.text("ok")
+
+        routers.append(router)
+    app.add(routers)
+    return app
+
+
+async def measure(modules: int, scoped: bool) -> float:
+    app = build_app(modules, scoped)
+    app.freeze()
+    request = make_mocked_request("GET", f"/m{modules - 1}", app=app)
+
+    start = perf_counter()
+    for _ in range(REQUESTS):
+        request._match_info = await app.router.resolve(request)
+        request._match_info.add_app(app)
+        await app._handle(request)
+    return (perf_counter() - start) / REQUESTS * 1e6
+
+
+async def main() -> None:
+    print(f"{'modules':>8} {'global, us':>12} {'scoped, us':>12}")
+    for modules in MODULE_COUNTS:
+        common = await measure(modules, scoped=False)
+        scoped = await measure(modules, scoped=True)
+        print(f"{modules:>8} {common:>12.2f} {scoped:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
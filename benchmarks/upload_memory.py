@@ -0,0 +1,89 @@
+"""Peak memory of concurrent multipart uploads.
+
+A server receives the same number of concurrent uploads for every case and
+tracemalloc reports the peak of the memory allocated while they are read.
+Reading the whole body with `request.read()` or `request.post()` keeps every
+file in memory, while `web.multipart_body` spools files larger than
+`spool_size` to temporary files, and its `stream=True` mode keeps only the
+current chunk.
+
+    PYTHONPATH=. python benchmarks/upload_memory.py
+"""
+
+import asyncio
+import tracemalloc
+
+from aiohttp import ClientSession, FormData
+from aiohttp.test_utils import TestServer
+
+from moduleweb import web
+
+UPLOADS = 20
+FILE_SIZE = 4 * 1024 * 1024
+PAYLOAD = b"x" * FILE_SIZE
+
+
+async def read_body(request):
+    return web.text(str(len(await request.read())))
+
+
+async def read_post(request):
+    data = await request.post()
+    return web.text(str(len(data["file"].file.read())))
+
+
+async def spooled(request):
+    return web.text(str(request["body"]["file"].size))
+
+
+async def streamed(request):
+    size = 0
+    async for part in request["body"]:
+        async for chunk in part:
+            size += len(chunk)
+    return web.text(str(size))
+
+
+def app() -> "App":
+    app = web.App(client_max_size=2 * FILE_SIZE)
+    router = web.Router()
+    router.post("/read")(read_body)
+    router.post("/post")(read_post)
+    router.post("/spooled", body=web.multipart_body(max_size=2 * FILE_SIZE))(spooled)
+    router.post("/streamed", body=web.multipart_body(max_size=2 * FILE_SIZE, stream=True))(streamed)
+    app.add([router])
+    return app
+
+
+async def upload(session: ClientSession, url: str) -> None:
+    data = FormData()
+    data.add_field("file", PAYLOAD, filename="upload.bin", content_type="application/octet-stream")
+    async with session.post(url, data=data) as response:
+        assert response.status == 200, await response.text()
+
+
+async def peak(server: TestServer, session: ClientSession, path: str) -> float:
+    url = str(server.make_url(path))
+    await upload(session, url)
+    tracemalloc.start()
+    await asyncio.gather(*[upload(session, url) for _ in range(UPLOADS)])
+    _, size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / 1024 / 1024
+
+
+async def main() -> None:
+    server = TestServer(app())
+    await server.start_server()
+    try:
+        async with ClientSession() as session:
+            print(f"{UPLOADS} concurrent uploads of {FILE_SIZE // 1024 // 1024} MB")
+            print(f"{'reader':<10} {'peak MB':>8}")
+            for path in ("/read", "/post", "/spooled", "/streamed"):
+                print(f"{path[1:]:<10} {await peak(server, session, path):>8.1f}")
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,13 @@
+from .micro import run_micro
+from .load import run_load, drive, serve
+from .results import save, load, compare
+
+__all__ = (
+    "run_micro",
+    "run_load",
+    "drive",
+    "serve",
+    "save",
+    "load",
+    "compare"
+)
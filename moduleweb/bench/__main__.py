@@ -0,0 +1,66 @@
+"""Benchmarks of moduleweb and of applications built with it.
+
+    python -m moduleweb.bench micro --output micro.json
+    python -m moduleweb.bench load package.main:app --path / --path /api --output load.json
+    python -m moduleweb.bench load http://127.0.0.1:8080 --duration 30 --concurrency 100
+    python -m moduleweb.bench compare micro-old.json micro.json
+"""
+
+import asyncio
+import json
+import sys
+
+from argparse import ArgumentParser
+
+from .micro import run_micro
+from .load import run_load
+from .results import save, load, compare, print_comparison
+
+
+def parse_arguments() -> "Namespace":
+    parser = ArgumentParser(prog="python -m moduleweb.bench", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    micro = commands.add_parser("micro", help="time responses, middleware chains and module registration")
+    micro.add_argument("--number", type=int, default=5000, help="requests per case")
+    micro.add_argument("--output", help="file to save the results to as JSON")
+
+    driver = commands.add_parser("load", help="send HTTP requests to an application on localhost")
+    driver.add_argument("target", help="'package.module:app' to start or the URL of a running server")
+    driver.add_argument("--path", action="append", dest="paths", help="path to request, can be repeated")
+    driver.add_argument("--duration", type=float, default=10, help="seconds per path")
+    driver.add_argument("--concurrency", type=int, default=50, help="requests in flight")
+    driver.add_argument("--method", default="GET")
+    driver.add_argument("--output", help="file to save the results to as JSON")
+
+    comparison = commands.add_parser("compare", help="compare two saved results")
+    comparison.add_argument("baseline")
+    comparison.add_argument("current")
+    return parser.parse_args()
+
+
+def main() -> None:
+    arguments = parse_arguments()
+    if arguments.command == "compare":
+        print_comparison(compare(load(arguments.baseline), load(arguments.current)))
+        return
+
+    if arguments.command == "micro":
+        results = asyncio.run(run_micro(arguments.number))
+    else:
+        sys.path.insert(0, "")
+        results = asyncio.run(run_load(
+            arguments.target,
+            arguments.paths or ["/"],
+            duration=arguments.duration,
+            concurrency=arguments.concurrency,
+            method=arguments.method
+        ))
+
+    print(json.dumps(results, indent=2))
+    if arguments.output:
+        save(results, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
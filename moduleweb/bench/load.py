@@ -0,0 +1,76 @@
+from aiohttp import web, ClientSession, TCPConnector, ClientError
+from asyncio import gather, TimeoutError
+from contextlib import asynccontextmanager
+from importlib import import_module
+from time import perf_counter
+from typing import Dict, Any, Optional, List, Union
+
+from .results import percentiles
+
+__all__ = ("run_load", "drive", "serve", "import_app")
+
+
+def import_app(target: str) -> "App":
+    module_name, _, attribute = target.partition(":")
+    app = getattr(import_module(module_name), attribute or "app", None)
+
+    assert isinstance(app, web.Application), \
+        f"The application was not found in '{target}'!"
+    return app
+
+
+@asynccontextmanager
+async def serve(app: "App", host: Optional[str] = "127.0.0.1", port: Optional[int] = 0) -> str:
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    try:
+        host, port = runner.addresses[0][:2]
+        yield f"http://{host}:{port}"
+    finally:
+        await runner.cleanup()
+
+
+async def drive(url: str, *, duration: Optional[float] = 10, concurrency: Optional[int] = 50,
+                method: Optional[str] = "GET", warmup: Optional[float] = 1) -> Dict[str, Any]:
+    latencies, statuses, errors = [], {}, 0
+    connector = TCPConnector(limit=concurrency, force_close=False)
+    async with ClientSession(connector=connector) as session:
+        async def worker(deadline: float, record: bool) -> None:
+            nonlocal errors
+            while perf_counter() < deadline:
+                start = perf_counter()
+                try:
+                    async with session.request(method, url) as response:
+                        await response.read()
+                except (ClientError, TimeoutError):
+                    errors += record
+                    continue
+                if record:
+                    latencies.append((perf_counter() - start) * 1000)
+                    statuses[response.status] = statuses.get(response.status, 0) + 1
+
+        if warmup:
+            await gather(*[worker(perf_counter() + warmup, False) for _ in range(concurrency)])
+        start = perf_counter()
+        await gather(*[worker(start + duration, True) for _ in range(concurrency)])
+        elapsed = perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        **{f"{name}_ms": value for name, value in percentiles(latencies).items()},
+        "max_ms": max(latencies, default=0.0),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())}
+    }
+
+
+async def run_load(target: Union[str, "App"], paths: Optional[List[str]] = ("/",), **kwargs: Any) -> Dict[str, Any]:
+    if isinstance(target, str) and target.startswith(("http://", "https://")):
+        return {path: await drive(target.rstrip("/") + path, **kwargs) for path in paths}
+
+    app = import_app(target) if isinstance(target, str) else target
+    async with serve(app) as url:
+        return {path: await drive(url + path, **kwargs) for path in paths}
@@ -0,0 +1,185 @@
+import sys
+
+from aiohttp.abc import AbstractStreamWriter
+from aiohttp.test_utils import make_mocked_request
+from importlib import invalidate_caches
+from pathlib import Path
+from statistics import mean
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from unittest import mock
+from typing import Dict, Any, Optional, List
+
+from .. import web
+from .results import percentiles
+
+__all__ = ("run_micro", "measure")
+
+RESPONSE_PATHS = ("/text", "/text-const", "/json", "/render", "/file", "/redirect", "/stream")
+TEMPLATE = """<html><body><ul>{% for item in items %}<li>{{ item }}</li>{% endfor %}</ul></body></html>"""
+
+VIEW = """
+from moduleweb import web
+
+router = web.Router()
+
+
+@router.get("/{name}/")
+async def index(request):
+    return web.text("{name}")
+"""
+
+
+class NullWriter(AbstractStreamWriter):
+    def __init__(self) -> None:
+        self.buffer_size = 0
+        self.output_size = 0
+        self.length = 0
+
+    def __repr__(self) -> str:
+        return f"<NullWriter output_size={self.output_size}>"
+
+    async def write(self, chunk: bytes) -> None:
+        self.output_size += len(chunk)
+
+    async def write_eof(self, chunk: Optional[bytes] = b"") -> None:
+        self.output_size += len(chunk)
+
+    async def drain(self) -> None:
+        pass
+
+    def enable_compression(self, encoding: Optional[str] = "deflate", strategy: Optional[int] = None) -> None:
+        pass
+
+    def enable_chunking(self) -> None:
+        pass
+
+    async def write_headers(self, status_line: str, headers: "CIMultiDict") -> None:
+        pass
+
+    def send_headers(self) -> None:
+        pass
+
+
+class NullTransport:
+    def __repr__(self) -> str:
+        return "<NullTransport>"
+
+    def get_extra_info(self, name: str, default: Optional[Any] = None) -> Any:
+        return default
+
+    def is_closing(self) -> bool:
+        return False
+
+
+async def measure(app: "App", path: str, number: int) -> Dict[str, float]:
+    protocol, transport, samples = mock.Mock(), NullTransport(), []
+    for _ in range(number):
+        request = make_mocked_request("GET", path, app=app, writer=NullWriter(),
+                                      protocol=protocol, transport=transport)
+        start = perf_counter()
+        response = await app._handle(request)
+        samples.append((perf_counter() - start) * 1e6)
+        assert response.status < 400, \
+            f"The benchmark request to '{path}' failed with {response.status}!"
+    return {"mean_us": mean(samples), **{f"{name}_us": value for name, value in percentiles(samples).items()}}
+
+
+async def started(app: "App") -> "App":
+    app.freeze()
+    await app.startup()
+    return app
+
+
+async def stopped(app: "App") -> None:
+    await app.shutdown()
+    await app.cleanup()
+
+
+def response_app(directory: Path) -> "App":
+    (directory / "templates").mkdir()
+    (directory / "templates" / "list.html").write_text(TEMPLATE)
+    (directory / "static.txt").write_bytes(b"x" * 4096)
+
+    app = web.App()
+    router = web.Router([web.template("templates", str(directory / "templates"))])
+    items, constant = list(range(50)), web.text.const("ok")
+
+    async def chunks(request: "Request", response: "StreamResponse") -> None:
+        for _ in range(4):
+            await response.write(b"x" * 1024)
+
+    router.lib("/text", lambda request: web.text("ok"), run_inline=True)
+    router.lib("/text-const", lambda request: constant, run_inline=True)
+    router.lib("/json", lambda request: web.json({"items": items}), run_inline=True)
+    router.lib("/render", lambda request: web.render("templates/list.html", {"items": items}), run_inline=True)
+    router.lib("/file", lambda request: web.file(str(directory / "static.txt"), cache=True), run_inline=True)
+    router.lib("/redirect", lambda request: web.redirect("/text"), run_inline=True)
+    router.lib("/stream", lambda request: web.stream(chunks), run_inline=True)
+    app.add([router])
+    return app
+
+
+def middleware_app(depth: int) -> "App":
+    app = web.App()
+    router = web.Router(scoped=True)
+    for _ in range(depth):
+        async def middleware(request: "Request", handler: object) -> Any:
+            return await handler(request)
+
+        router.middleware(middleware)
+    router.lib("/", lambda request: web.text("ok"), run_inline=True)
+    app.add([router])
+    return app
+
+
+def registration_time(root: Path, package: str, modules: int) -> float:
+    (root / package).mkdir()
+    (root / package / "__init__.py").write_text("")
+    for index in range(modules):
+        directory = root / package / f"m{index}"
+        directory.mkdir()
+        (directory / "__init__.py").write_text("")
+        (directory / "view.py").write_text(VIEW.replace("{name}", f"m{index}"))
+    invalidate_caches()
+
+    app = web.App(f"{package}.main")
+    start = perf_counter()
+    app.add([web.module(f"m{index}") for index in range(modules)])
+    elapsed = perf_counter() - start
+
+    for name in [name for name in sys.modules if name == package or name.startswith(package + ".")]:
+        del sys.modules[name]
+    return elapsed * 1000
+
+
+async def run_micro(number: Optional[int] = 5000, depths: Optional[List[int]] = (0, 1, 5, 20),
+                    module_counts: Optional[List[int]] = (10, 100)) -> Dict[str, Any]:
+    results = {"responses": {}, "middlewares": {}, "registration": {}}
+    with TemporaryDirectory() as directory:
+        app = await started(response_app(Path(directory)))
+        try:
+            for path in RESPONSE_PATHS:
+                await measure(app, path, min(number, 100))
+                results["responses"][path[1:]] = await measure(app, path, number)
+        finally:
+            await stopped(app)
+
+    for depth in depths:
+        app = await started(middleware_app(depth))
+        try:
+            results["middlewares"][f"depth_{depth}"] = await measure(app, "/", number)
+        finally:
+            await stopped(app)
+
+    with TemporaryDirectory() as directory:
+        sys.path.insert(0, directory)
+        try:
+            for index, modules in enumerate(module_counts):
+                package = f"moduleweb_bench_{index}"
+                results["registration"][f"modules_{modules}"] = {
+                    "add_ms": registration_time(Path(directory), package, modules)
+                }
+        finally:
+            sys.path.remove(directory)
+    return results
@@ -0,0 +1,67 @@
+import json
+import platform
+import sys
+
+from aiohttp import __version__ as aiohttp_version
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Tuple
+
+from .. import __version__
+
+__all__ = ("percentiles", "environment", "save", "load", "compare")
+
+
+def percentiles(samples: List[float], points: Tuple[int, ...] = (50, 90, 99)) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{point}": 0.0 for point in points}
+    return {
+        f"p{point}": ordered[min(len(ordered) - 1, len(ordered) * point // 100)]
+        for point in points
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "moduleweb": __version__,
+        "aiohttp": aiohttp_version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
+    }
+
+
+def save(results: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump({"environment": environment(), "results": results}, file, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    values = {}
+    for name, value in results.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{name}."))
+        elif isinstance(value, (int, float)):
+            values[prefix + name] = value
+    return values
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Tuple[str, float, float, float]]:
+    before, after = flatten(baseline), flatten(current)
+    return [
+        (name, before[name], after[name], (after[name] - before[name]) / before[name] if before[name] else 0.0)
+        for name in before if name in after
+    ]
+
+
+def print_comparison(rows: List[Tuple[str, float, float, float]], file: Any = sys.stdout) -> None:
+    width = max((len(name) for name, *_ in rows), default=10)
+    print(f"{'metric':<{width}} {'baseline':>12} {'current':>12} {'change':>8}", file=file)
+    for name, before, after, change in rows:
+        print(f"{name:<{width}} {before:>12.2f} {after:>12.2f} {change:>+8.1%}", file=file)
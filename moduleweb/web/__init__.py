@@ -2,7 +2,12 @@ from .app import App
 from .module import module
 from .router import Router
 from .options import template, preroute
-from .response import text, json, render, file, redirect, stream, socket
+from .cache import cache
+from .compress import compression
+from .limits import limit
+from .body import json_body, form_body, multipart_body
+from .exporter import metrics
+from .response import text, json, render, file, redirect, stream, json_stream, sse, socket
 
 __all__ = (
     "App",
@@ -10,11 +15,20 @@ __all__ = (
     "Router",
     "template",
     "preroute",
+    "cache",
+    "compression",
+    "limit",
+    "json_body",
+    "form_body",
+    "multipart_body",
+    "metrics",
     "text",
     "json",
     "render",
     "file",
     "redirect",
     "stream",
+    "json_stream",
+    "sse",
     "socket"
 )
@@ -4,12 +4,30 @@ from typing import Optional, Any, List, Union
 from .response import response_processor, render_setuper
 from .module import Module
 from .router import Router
+from .executor import ThreadPool
+from .encoder import Encoder
+from .cache import ResponseCache
+from .coalesce import Coalescer
+from .tasks import TaskQueue
+from .resources import Resources, Resource
+from .compress import compression as compression_policy
+from .hub import close_hubs
+from .workers import Supervisor
+from .assets import asset_setuper
+from .files import FileCache
+from .metrics import Metrics
+from .reload import Registration, Reloader
 
 __all__ = ("App",)
 
 
 class App(web.Application):
-    def __init__(self, import_name: Optional[str] = "__main__", **kwargs: Any) -> None:
+    def __init__(self, import_name: Optional[str] = "__main__", *,
+                 max_workers: Optional[int] = None, json_backend: Optional[Union[str, object]] = None,
+                 production: Optional[bool] = False, bytecode_cache: Optional[str] = None,
+                 sampling: Optional[float] = 0.0, etags: Optional[bool] = False,
+                 compression: Optional[Union[bool, "Compression"]] = False,
+                 **kwargs: Any) -> None:
         """Method of the constructor of the modular application class.
 
         :param import_name:    The `import_name` parameter is very important for
@@ -26,6 +44,61 @@ class App(web.Application):
                                `__name__` to `import_name`. Defaults to "__main__".
         :type import_name:     Optional[str]
 
+        :param max_workers:    Synchronous handlers, middlewares, streams and sockets
+                               are run in a thread pool so that they do not block the
+                               event loop. This parameter limits the number of threads
+                               in that pool, its load is available in `executor`.
+                               Defaults to the same value as `ThreadPoolExecutor`.
+        :type max_workers:     Optional[int]
+
+        :param json_backend:   The name of the library that serializes `json` responses:
+                               "orjson", "ujson" or "json", or your own function taking
+                               the data and the `default` hook and returning bytes. Hooks
+                               for your own types are registered with `encoder.hook`
+                               and apply with every library. A hook for a UUID or enum
+                               type switches orjson to the standard library, because
+                               orjson serializes these types itself without calling
+                               hooks. Defaults to the fastest library installed.
+        :type json_backend:    Optional[Union[str, object]]
+
+        :param production:     In production mode all templates of the registered
+                               template folders are compiled at startup, the time spent
+                               on each folder is logged and saved in `template_stats`,
+                               and templates are no longer checked for changes on
+                               every render, and template folders serve their files
+                               precompressed from memory. Defaults to False.
+        :type production:      Optional[bool]
+
+        :param bytecode_cache: The directory where compiled templates are kept between
+                               restarts in production mode. Defaults to None, which means
+                               the temporary directory of the system.
+        :type bytecode_cache:  Optional[str]
+
+        :param sampling:       The share of requests for which the time spent in the
+                               middlewares, the handler, the response conversion and
+                               writing is recorded in `metrics` for every route and
+                               module. Register `web.metrics()` to export it in the
+                               Prometheus format. Defaults to 0.0, which disables it.
+        :type sampling:        Optional[float]
+
+        :param etags:          Every full response with a body gets an ETag header with
+                               a fast hash of the body (xxh3 if the optional `xxhash`
+                               package is installed, crc32 otherwise), and GET and HEAD
+                               requests with a matching If-None-Match or an
+                               If-Modified-Since that is not older than Last-Modified are
+                               answered with 304 before the body is sent. Routes can skip
+                               the handler entirely by passing a cheap version function
+                               to `etag`. Defaults to False.
+        :type etags:           Optional[bool]
+
+        :param compression:    Responses are compressed with brotli, gzip or deflate,
+                               whichever the client accepts, if their content type is
+                               textual and their body is large enough, and streams are
+                               compressed on the fly. Pass `web.compression(...)` to
+                               change the thresholds or True for the defaults. Defaults
+                               to False.
+        :type compression:     Optional[Union[bool, Compression]]
+
         :param kwargs:         Since a modular application created with **moduleweb**
                                inherits a regular application created with **aiohttp**,
                                during initialization you can pass some parameter
@@ -38,8 +111,35 @@ class App(web.Application):
 
         super().__init__(**kwargs)
         self.import_name = import_name
+        self.executor = ThreadPool(max_workers)
+        self.encoder = Encoder(json_backend)
+        self.cache = ResponseCache()
+        self.coalescer = Coalescer()
+        self.tasks = TaskQueue()
+        self.resources = Resources()
+        self.hubs = {}
+        self.event_buffers = {}
+        self.production = production
+        self.etags = etags
+        self.compression = compression_policy() if compression is True else compression or None
+        self.bytecode_cache = bytecode_cache
+        self.template_stats = {}
+        self.assets = {}
+        self.files = FileCache()
+        self.metrics = Metrics(sampling)
+        self.worker = 0
+        self.on_worker_start = []
+        self.registrations = []
         self.middlewares.append(response_processor)
+        self.on_startup.append(self.resources.open)
+        self.on_startup.append(self.tasks.start)
         self.on_startup.append(render_setuper)
+        self.on_startup.append(asset_setuper)
+        self.on_shutdown.append(close_hubs)
+        self.on_shutdown.append(self.tasks.drain)
+        self.on_cleanup.append(self.resources.close)
+        self.on_cleanup.append(self.executor.close)
+        self.cleanup_ctx.append(self.files.context)
 
     def __repr__(self) -> str:
         """Method that outputs a description of the object.
@@ -80,19 +180,94 @@ class App(web.Application):
         for module in modules:
             assert isinstance(module, (Module, Router)), \
                 "The add method registers only modules for the application!"
+            resources, middlewares = len(self.router.resources()), len(self.middlewares)
             module.register(self, self.location)
+            self.registrations.append(Registration(
+                module,
+                self.location,
+                list(self.router.resources())[resources:],
+                list(self.middlewares)[middlewares:]
+            ))
+
+    def resource(self, name: str, *, close: Optional[object] = None, stats: Optional[object] = None) -> object:
+        """Method that declares a resource shared by the whole application.
+
+        :param name:     The name under which the object created by the decorated
+                         factory is available in `resources` and is put into the
+                         requests of the routes that list it in `resources`. The
+                         factory takes the application and can be a coroutine
+                         function or an async generator that yields the object
+                         once and closes it after the yield. All factories of the
+                         application and its modules are run concurrently at
+                         startup, routers declare them with `router.resource`.
+        :type name:      str
+
+        :param close:    A function that takes the object and closes it on cleanup.
+                         Defaults to None, which means its `aclose` or `close` method.
+        :type close:     Optional[object]
 
-    def run(self, **kwargs: Any) -> None:
+        :param stats:    A function that takes the object and returns a dictionary
+                         with the usage of its pool, which is added to the counts
+                         of `resources.stats()`. Defaults to None.
+        :type stats:     Optional[object]
+
+        :return:         Decorator that declares the factory.
+        :rtype:          object
+        """
+
+        def inner(factory: object) -> object:
+            self.resources.declare(Resource(name, factory, close, stats))
+            return factory
+
+        return inner
+
+    def run(self, *, workers: Optional[int] = 1, health_timeout: Optional[float] = 30,
+            reload: Optional[bool] = False, **kwargs: Any) -> None:
         """Method that launches your modular application.
 
-        :param kwargs:    Since a modular application created with **moduleweb**
-                          inherits a regular application created with **aiohttp**,
-                          at startup you can pass all the same parameters that you
-                          would pass to `web.run_app` in **aiohttp**.
-        :type kwargs:     Any
+        :param workers:           The number of processes serving the application. When
+                                  there are several of them, the application is forked
+                                  into workers that accept connections on one socket
+                                  bound in advance, or each bind it with SO_REUSEPORT if
+                                  `reuse_port` is passed. Crashed and hung workers are
+                                  restarted, SIGHUP gracefully replaces all of them, and
+                                  callbacks from `on_worker_start` are called in every
+                                  worker after the fork. Defaults to 1.
+        :type workers:            Optional[int]
 
-        :return:          Nothing.
-        :rtype:           None
+        :param health_timeout:    The number of seconds after which a worker whose
+                                  event loop has not responded is considered hung and is
+                                  restarted. Pass None to only watch for exited workers.
+                                  Defaults to 30.
+        :type health_timeout:     Optional[float]
+
+        :param reload:            Development mode in which the directories of the modules
+                                  added to the application are watched for changes. When
+                                  a file of a module changes, only that module and its
+                                  view are imported again, the routes and middlewares of
+                                  its router replace the old ones without a restart, its
+                                  templates are dropped from the template cache, and the
+                                  time the reload took is logged. Lazy modules and routers
+                                  added directly are not watched. Only works with a single
+                                  worker. Defaults to False.
+        :type reload:             Optional[bool]
+
+        :param kwargs:            Since a modular application created with **moduleweb**
+                                  inherits a regular application created with **aiohttp**,
+                                  at startup you can pass all the same parameters that you
+                                  would pass to `web.run_app` in **aiohttp**.
+        :type kwargs:             Any
+
+        :return:                  Nothing.
+        :rtype:                   None
         """
 
-        web.run_app(self, **kwargs)
+        if reload:
+            assert workers == 1, \
+                "Hot reload works only with a single worker!"
+            Reloader(self).install()
+
+        if workers > 1:
+            Supervisor(self, workers, health_timeout, **kwargs).run()
+        else:
+            web.run_app(self, **kwargs)
@@ -0,0 +1,160 @@
+from attr import dataclass
+from aiohttp import web, hdrs
+from asyncio import gather
+from aiohttp_jinja2 import get_env
+from gzip import compress as gzip_compress
+from mimetypes import guess_type
+from pathlib import Path
+from zlib import crc32
+from typing import Dict, Any, Optional, List
+
+from .conditional import make_etag, etag_matches
+
+try:
+    from brotli import compress as brotli_compress
+except ImportError:
+    brotli_compress = None
+
+__all__ = ("AssetResource", "asset_setuper", "add_assets")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+COMPRESSIBLE_TYPES = (
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "application/wasm",
+    "image/svg+xml"
+)
+
+
+def accepted_encodings(request: web.Request) -> List[str]:
+    encodings = []
+    for token in request.headers.get(hdrs.ACCEPT_ENCODING, "").split(","):
+        name, _, params = token.partition(";")
+        quality = params.strip()
+        try:
+            if quality.startswith("q=") and float(quality[2:]) == 0:
+                continue
+        except ValueError:
+            continue
+        if name.strip():
+            encodings.append(name.strip().lower())
+    return encodings
+
+
+@dataclass(repr=False)
+class Asset:
+    content_type: str
+    etag: str
+    last_modified: float
+    variants: Dict[str, bytes]
+    cache_control: str
+
+    def __repr__(self) -> str:
+        return f"<Asset etag='{self.etag}'>"
+
+    def respond(self, request: web.Request) -> web.Response:
+        headers = {
+            hdrs.ETAG: self.etag,
+            hdrs.CACHE_CONTROL: self.cache_control,
+            hdrs.VARY: hdrs.ACCEPT_ENCODING
+        }
+        if etag_matches(request, self.etag):
+            return web.Response(status=304, headers=headers)
+
+        encodings = accepted_encodings(request) if len(self.variants) > 1 else ()
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in encodings:
+                headers[hdrs.CONTENT_ENCODING] = encoding
+                break
+        else:
+            encoding = "identity"
+
+        response = web.Response(body=self.variants[encoding], headers=headers, content_type=self.content_type)
+        response.last_modified = self.last_modified
+        return response
+
+
+class AssetResource(web.StaticResource):
+    def __init__(self, prefix: str, directory: str, *, max_size: Optional[int] = 1048576,
+                 **kwargs: Any) -> None:
+        super().__init__(prefix, directory, **kwargs)
+        self.max_size = max_size
+        self.assets = None
+        self.urls = {}
+
+    def __repr__(self) -> str:
+        return f"<AssetResource prefix='{self._prefix}', assets={len(self.assets or ())}>"
+
+    def _compress(self, content_type: str, body: bytes) -> Dict[str, bytes]:
+        variants = {"identity": body}
+        if len(body) < 256 or not (content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES):
+            return variants
+
+        variants["gzip"] = gzip_compress(body, 9)
+        if brotli_compress is not None:
+            variants["br"] = brotli_compress(body, quality=11)
+        return {
+            encoding: variant for encoding, variant in variants.items()
+            if encoding == "identity" or len(variant) < len(body)
+        }
+
+    def prepare(self) -> Dict[str, "Asset"]:
+        assets, urls = {}, {}
+        directory = Path(self._directory)
+        root = directory.resolve()
+        for path in directory.rglob("*"):
+            if not path.is_file() or path.stat().st_size > self.max_size:
+                continue
+            if not self._follow_symlinks and root not in path.resolve().parents:
+                continue
+
+            body = path.read_bytes()
+            name = path.relative_to(directory).as_posix()
+            content_type = guess_type(name)[0] or "application/octet-stream"
+            variants = self._compress(content_type, body)
+            etag, modified = make_etag(body), path.stat().st_mtime
+
+            assets[name] = Asset(content_type, etag, modified, variants, REVALIDATE)
+            stem, dot, extension = name.rpartition(".") if "." in path.name else (name, "", "")
+            hashed = f"{stem}.{crc32(body):08x}{dot}{extension}"
+            assets[hashed] = Asset(content_type, etag, modified, variants, IMMUTABLE)
+            urls[name] = f"{self._prefix}/{hashed}"
+
+        self.assets, self.urls = assets, urls
+        return assets
+
+    def url(self, name: str) -> str:
+        return self.urls.get(name) or f"{self._prefix}/{name}"
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        if self.assets is not None and hdrs.RANGE not in request.headers:
+            asset = self.assets.get(request.match_info["filename"])
+            if asset is not None:
+                return asset.respond(request)
+        return await super()._handle(request)
+
+
+async def add_assets(app: "App", router: web.UrlDispatcher) -> None:
+    resources = [resource for resource in router._resources if isinstance(resource, AssetResource)]
+    await gather(*[app.executor.run(resource.prepare) for resource in resources])
+
+    for resource in resources:
+        app.assets[resource._prefix[1:]] = resource
+        app.logger.info(
+            "Prepared %d static files of '%s'",
+            len(resource.urls), resource._prefix[1:]
+        )
+
+
+def asset_url(app: "App", path: str) -> str:
+    name, _, filename = path.partition("/")
+    resource = app.assets.get(name)
+    return resource.url(filename) if resource is not None else "/" + path
+
+
+async def asset_setuper(app: "App") -> None:
+    get_env(app).globals["asset_url"] = lambda path: asset_url(app, path)
+    if app.production:
+        await add_assets(app, app.router)
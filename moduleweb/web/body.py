@@ -0,0 +1,287 @@
+from aiohttp import web, hdrs, BodyPartReader
+from multidict import MultiDict, MultiDictProxy
+from tempfile import SpooledTemporaryFile
+from urllib.parse import parse_qsl
+from typing import Any, Optional, AsyncIterator
+
+__all__ = ("json_body", "form_body", "multipart_body")
+
+BODY = "body"
+CHUNK_SIZE = 65536
+
+
+def too_large(max_size: int, size: int) -> web.HTTPRequestEntityTooLarge:
+    return web.HTTPRequestEntityTooLarge(max_size, size)
+
+
+class BodyPolicy:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} max_size={self.max_size}>"
+
+    def check_type(self, request: web.Request) -> None:
+        if not self.accepts(request.content_type):
+            raise web.HTTPUnsupportedMediaType(text=f"Unsupported request content type '{request.content_type}'")
+
+    def check_length(self, request: web.Request) -> None:
+        length = request.content_length
+        if length is not None and length > self.max_size:
+            raise too_large(self.max_size, length)
+
+    async def read(self, request: web.Request) -> bytes:
+        chunks, size = [], 0
+        async for chunk in request.content.iter_chunked(CHUNK_SIZE):
+            size += len(chunk)
+            if size > self.max_size:
+                raise too_large(self.max_size, size)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def close(self, body: Any) -> None:
+        pass
+
+    def wrap(self, handler: object) -> object:
+        async def inner(request: web.Request) -> Any:
+            if not request.body_exists:
+                request[BODY] = None
+                return await handler(request)
+
+            self.check_type(request)
+            self.check_length(request)
+            body = request[BODY] = await self.parse(request)
+            try:
+                return await handler(request)
+            finally:
+                self.close(body)
+
+        return inner
+
+
+class JsonBody(BodyPolicy):
+    def __init__(self, max_size: int, model: Optional[object]) -> None:
+        super().__init__(max_size)
+        self.model = model
+
+    def accepts(self, content_type: str) -> bool:
+        return content_type == "application/json" or content_type.endswith("+json")
+
+    async def parse(self, request: web.Request) -> Any:
+        data = await self.read(request)
+        try:
+            value = request.app.encoder.decode(data) if data else None
+        except ValueError:
+            raise web.HTTPBadRequest(text="The request body is not valid JSON")
+        if self.model is None:
+            return value
+
+        try:
+            return self.model(**value) if isinstance(value, dict) else self.model(value)
+        except (TypeError, ValueError) as exc:
+            raise web.HTTPUnprocessableEntity(text=str(exc))
+
+
+class FormBody(BodyPolicy):
+    def accepts(self, content_type: str) -> bool:
+        return content_type == "application/x-www-form-urlencoded"
+
+    async def parse(self, request: web.Request) -> MultiDictProxy:
+        data = await self.read(request)
+        pairs = parse_qsl(data.decode(request.charset or "utf-8"), keep_blank_values=True)
+        return MultiDictProxy(MultiDict(pairs))
+
+
+class UploadFile:
+    def __init__(self, name: str, filename: str, content_type: str, file: "SpooledTemporaryFile",
+                 size: int) -> None:
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.file = file
+        self.size = size
+
+    def __repr__(self) -> str:
+        return f"<UploadFile filename='{self.filename}', size={self.size}>"
+
+    def read(self) -> bytes:
+        return self.file.read()
+
+
+class Part:
+    def __init__(self, part: "BodyPartReader", policy: "MultipartBody", stream: "PartStream") -> None:
+        self.name = part.name
+        self.filename = part.filename
+        self.content_type = part.headers.get(hdrs.CONTENT_TYPE, "application/octet-stream")
+        self._part = part
+        self._policy = policy
+        self._stream = stream
+
+    def __repr__(self) -> str:
+        return f"<Part name='{self.name}', filename='{self.filename}'>"
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        size = 0
+        while True:
+            chunk = await self._part.read_chunk(CHUNK_SIZE)
+            if not chunk:
+                return
+            size += len(chunk)
+            self._stream.count(len(chunk))
+            if size > self._policy.max_file_size:
+                raise too_large(self._policy.max_file_size, size)
+            yield chunk
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self])
+
+    async def text(self) -> str:
+        return (await self.read()).decode(self._part.get_charset("utf-8"))
+
+
+class PartStream:
+    def __init__(self, reader: "MultipartReader", policy: "MultipartBody") -> None:
+        self.reader = reader
+        self.policy = policy
+        self.size = 0
+
+    def __repr__(self) -> str:
+        return f"<PartStream size={self.size}>"
+
+    def count(self, size: int) -> None:
+        self.size += size
+        if self.size > self.policy.max_size:
+            raise too_large(self.policy.max_size, self.size)
+
+    async def __aiter__(self) -> AsyncIterator["Part"]:
+        while True:
+            part = await self.reader.next()
+            if part is None:
+                return
+            if not isinstance(part, BodyPartReader):
+                raise web.HTTPBadRequest(text="Nested multipart bodies are not supported")
+            yield Part(part, self.policy, self)
+            await part.release()
+
+
+class MultipartBody(BodyPolicy):
+    def __init__(self, max_size: int, max_file_size: Optional[int], spool_size: int, directory: Optional[str],
+                 stream: bool) -> None:
+        super().__init__(max_size)
+        self.max_file_size = max_file_size or max_size
+        self.spool_size = spool_size
+        self.directory = directory
+        self.stream = stream
+
+    def accepts(self, content_type: str) -> bool:
+        return content_type.startswith("multipart/")
+
+    async def _spool(self, request: web.Request, part: "Part") -> "UploadFile":
+        file = SpooledTemporaryFile(self.spool_size, dir=self.directory)
+        size = 0
+        try:
+            async for chunk in part:
+                size += len(chunk)
+                if size > self.spool_size:
+                    await request.app.executor.run(file.write, chunk)
+                else:
+                    file.write(chunk)
+            file.seek(0)
+        except BaseException:
+            file.close()
+            raise
+        return UploadFile(part.name, part.filename, part.content_type, file, size)
+
+    async def parse(self, request: web.Request) -> Any:
+        parts = PartStream(await request.multipart(), self)
+        if self.stream:
+            return parts
+
+        fields = MultiDict()
+        try:
+            async for part in parts:
+                if part.filename:
+                    fields.add(part.name, await self._spool(request, part))
+                else:
+                    fields.add(part.name, await part.text())
+        except BaseException:
+            self.close(fields)
+            raise
+        return MultiDictProxy(fields)
+
+    def close(self, body: Any) -> None:
+        if isinstance(body, (MultiDict, MultiDictProxy)):
+            for value in body.values():
+                if isinstance(value, UploadFile):
+                    value.file.close()
+
+
+def json_body(max_size: Optional[int] = 1048576, *, model: Optional[object] = None) -> "JsonBody":
+    """A function that returns a policy reading the request body as JSON.
+
+    :param max_size:    The largest body in bytes, larger requests are answered
+                        with 413 as soon as their Content-Length or the bytes read
+                        so far exceed it. Defaults to 1048576.
+    :type max_size:     Optional[int]
+
+    :param model:       A class the decoded object is passed to as keyword
+                        arguments, for example a dataclass, and the request is
+                        answered with 422 if it does not accept them. Defaults
+                        to None, the decoded object itself.
+    :type model:        Optional[object]
+
+    :return:            Body policy object, the parsed body is in `request["body"]`.
+    :rtype:             JsonBody
+    """
+
+    return JsonBody(max_size, model)
+
+
+def form_body(max_size: Optional[int] = 1048576) -> "FormBody":
+    """A function that returns a policy reading the request body as a URL-encoded form.
+
+    :param max_size:    The largest body in bytes, larger requests are answered
+                        with 413. Defaults to 1048576.
+    :type max_size:     Optional[int]
+
+    :return:            Body policy object, the fields are in `request["body"]`.
+    :rtype:             FormBody
+    """
+
+    return FormBody(max_size)
+
+
+def multipart_body(max_size: Optional[int] = 104857600, *, max_file_size: Optional[int] = None,
+                   spool_size: Optional[int] = 1048576, directory: Optional[str] = None,
+                   stream: Optional[bool] = False) -> "MultipartBody":
+    """A function that returns a policy reading the request body as multipart form data.
+
+    :param max_size:         The largest body in bytes, larger requests are answered
+                             with 413 without reading the rest. Defaults to 104857600.
+    :type max_size:          Optional[int]
+
+    :param max_file_size:    The largest single file in bytes. Defaults to `max_size`.
+    :type max_file_size:     Optional[int]
+
+    :param spool_size:       Files are kept in memory up to this size and written to
+                             a temporary file in the thread pool after it, so that
+                             concurrent uploads do not grow the memory of the worker.
+                             Defaults to 1048576.
+    :type spool_size:        Optional[int]
+
+    :param directory:        The directory of the temporary files. Defaults to None,
+                             the temporary directory of the system.
+    :type directory:         Optional[str]
+
+    :param stream:           Nothing is read in advance, `request["body"]` is an
+                             async iterator of parts, and each part is an async
+                             iterator of chunks. Defaults to False, a multidict of
+                             fields where files are `UploadFile` objects that are
+                             closed after the handler.
+    :type stream:            Optional[bool]
+
+    :return:                 Body policy object.
+    :rtype:                  MultipartBody
+    """
+
+    return MultipartBody(max_size, max_file_size, spool_size, directory, stream)
@@ -0,0 +1,178 @@
+from attr import dataclass
+from aiohttp import web, hdrs
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Any, Optional, List, Tuple
+
+from .response import BaseResponse
+from .conditional import make_etag, etag_matches
+
+__all__ = ("cache",)
+
+CACHED_METHODS = (hdrs.METH_GET, hdrs.METH_HEAD)
+
+
+@dataclass(repr=False)
+class Entry:
+    body: bytes
+    headers: Dict[str, str]
+    etag: str
+    expires: float
+    template: Optional[str]
+    tags: List[str]
+
+    def __repr__(self) -> str:
+        return f"<Entry etag='{self.etag}'>"
+
+    def respond(self, request: web.Request) -> web.Response:
+        if etag_matches(request, self.etag):
+            return web.Response(status=304, headers={hdrs.ETAG: self.etag})
+        response = web.Response(body=self.body, headers=self.headers)
+        response.headers[hdrs.ETAG] = self.etag
+        return response
+
+
+@dataclass(repr=False)
+class CachePolicy:
+    ttl: float
+    query: bool
+    headers: List[str]
+    key: Optional[object]
+    tags: List[str]
+
+    def __repr__(self) -> str:
+        return f"<CachePolicy ttl={self.ttl}>"
+
+    def cacheable(self, request: web.Request) -> bool:
+        return request.method in CACHED_METHODS
+
+    def make_key(self, request: web.Request, name: str) -> Tuple[Any, ...]:
+        if self.key is not None:
+            return name, self.key(request)
+        return (
+            name,
+            request.method,
+            request.path,
+            request.query_string if self.query else None,
+            request.headers.get(hdrs.COOKIE),
+            request.headers.get(hdrs.AUTHORIZATION),
+            *[request.headers.get(header) for header in self.headers]
+        )
+
+    def wrap(self, handler: object, name: str) -> object:
+        async def inner(request: web.Request) -> Any:
+            if not self.cacheable(request):
+                return await handler(request)
+
+            key = self.make_key(request, name)
+            entry = request.app.cache.get(key)
+            if entry is not None:
+                return entry.respond(request)
+
+            response = await handler(request)
+            template = getattr(response, "entry_point", None)
+            if isinstance(response, BaseResponse):
+                response = await response(request)
+            entry = request.app.cache.put(key, response, self, template)
+            return response if entry is None else entry.respond(request)
+
+        return inner
+
+
+def cache(ttl: Optional[float] = 60, *, query: Optional[bool] = True, headers: Optional[List[str]] = [],
+          key: Optional[object] = None, tags: Optional[List[str]] = []) -> "CachePolicy":
+    """A function that returns a response caching policy.
+
+    :param ttl:        The number of seconds during which the cached response is
+                       served without calling the handler or rendering the template.
+                       Defaults to 60.
+    :type ttl:         Optional[float]
+
+    :param query:      Whether the query string is a part of the cache key.
+                       Defaults to True.
+    :type query:       Optional[bool]
+
+    :param headers:    Names of the request headers that are a part of the cache
+                       key, for example "Accept-Language". Defaults to [].
+    :type headers:     Optional[List[str]]
+
+    :param key:        A function that takes the request and returns the cache key
+                       instead of the path, the query string, the credentials
+                       (Cookie and Authorization) and the headers. Defaults to None.
+    :type key:         Optional[object]
+
+    :param tags:       Tags by which cached responses can be invalidated together
+                       with `app.cache.invalidate(tag=...)`. Defaults to [].
+    :type tags:        Optional[List[str]]
+
+    :return:           Response caching policy object.
+    :rtype:            CachePolicy
+    """
+
+    return CachePolicy(ttl, query, headers, key, tags)
+
+
+class ResponseCache:
+    def __init__(self, max_entries: Optional[int] = 1024) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<ResponseCache entries={len(self._entries)}>"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def get(self, key: Tuple[Any, ...]) -> Optional["Entry"]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires > monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        if entry is not None:
+            del self._entries[key]
+            self.evictions += 1
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple[Any, ...], response: web.StreamResponse, policy: "CachePolicy",
+            template: Optional[str] = None) -> Optional["Entry"]:
+        if not isinstance(response, web.Response) or response.status != 200 or response.cookies \
+                or not isinstance(response.body, bytes):
+            return None
+
+        headers = {name: value for name, value in response.headers.items() if name != hdrs.CONTENT_LENGTH}
+        entry = Entry(
+            response.body,
+            headers,
+            response.headers.get(hdrs.ETAG) or make_etag(response.body),
+            monotonic() + policy.ttl,
+            template,
+            policy.tags
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def invalidate(self, *, template: Optional[str] = None, tag: Optional[str] = None) -> int:
+        keys = [
+            key for key, entry in self._entries.items()
+            if (template is None or entry.template == template) and (tag is None or tag in entry.tags)
+        ]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
@@ -0,0 +1,100 @@
+from aiohttp import web, hdrs
+from asyncio import get_running_loop, shield
+from typing import Dict, Any, Optional, Tuple
+
+from .response import BaseResponse, Stream, JsonStream, EventStream, WebSocket
+
+__all__ = ("Coalescer", "coalesce_handler")
+
+COALESCED_METHODS = (hdrs.METH_GET, hdrs.METH_HEAD)
+STREAMING_RESPONSES = (Stream, JsonStream, EventStream, WebSocket)
+
+
+class Snapshot:
+    __slots__ = ("body", "status", "reason", "headers")
+
+    def __init__(self, response: web.Response) -> None:
+        self.body = response.body
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = {name: value for name, value in response.headers.items() if name != hdrs.CONTENT_LENGTH}
+
+    def __repr__(self) -> str:
+        return f"<Snapshot status={self.status}>"
+
+    @staticmethod
+    def shareable(response: web.StreamResponse) -> bool:
+        return isinstance(response, web.Response) and not response.prepared and not response.cookies \
+            and isinstance(response.body, bytes) and response.status not in (206, 304)
+
+    def respond(self) -> web.Response:
+        return web.Response(body=self.body, status=self.status, reason=self.reason, headers=self.headers)
+
+
+class Coalescer:
+    def __init__(self) -> None:
+        self.leaders = 0
+        self.followers = 0
+        self.fallbacks = 0
+        self._inflight = {}
+
+    def __repr__(self) -> str:
+        return f"<Coalescer inflight={len(self._inflight)}>"
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.leaders + self.followers + self.fallbacks
+        return {
+            "inflight": len(self._inflight),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "fallbacks": self.fallbacks,
+            "ratio": self.followers / total if total else 0.0
+        }
+
+    def _count(self, app: "App", name: str, role: str) -> None:
+        setattr(self, role + "s", getattr(self, role + "s") + 1)
+        app.metrics.count("coalesced_requests", route=name, role=role)
+
+    async def run(self, request: web.Request, key: Tuple[Any, ...], name: str, handler: object) -> Any:
+        waiter = self._inflight.get(key)
+        if waiter is not None:
+            snapshot = await shield(waiter)
+            if snapshot is not None:
+                self._count(request.app, name, "follower")
+                return snapshot.respond()
+            self._count(request.app, name, "fallback")
+            return await handler(request)
+
+        waiter = self._inflight[key] = get_running_loop().create_future()
+        self._count(request.app, name, "leader")
+        snapshot = None
+        try:
+            response = await handler(request)
+            if isinstance(response, BaseResponse) and not isinstance(response, STREAMING_RESPONSES):
+                response = await response(request)
+            if Snapshot.shareable(response):
+                snapshot = Snapshot(response)
+            return response
+        finally:
+            del self._inflight[key]
+            waiter.set_result(snapshot)
+
+
+def default_key(request: web.Request) -> Tuple[Any, ...]:
+    headers = request.headers
+    return (request.method, request.path, request.query_string,
+            headers.get(hdrs.COOKIE), headers.get(hdrs.AUTHORIZATION))
+
+
+def coalesce_handler(handler: object, name: str, key: Optional[object] = None) -> object:
+    key = key if callable(key) else default_key
+
+    async def inner(request: web.Request) -> Any:
+        if request.method not in COALESCED_METHODS:
+            return await handler(request)
+        return await request.app.coalescer.run(request, (name, key(request)), name, handler)
+
+    return inner
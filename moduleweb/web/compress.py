@@ -0,0 +1,121 @@
+from aiohttp import web, hdrs
+from zlib import compressobj, DEFLATED, MAX_WBITS
+from typing import Optional, List
+
+from .assets import COMPRESSIBLE_TYPES, accepted_encodings
+
+try:
+    from brotli import compress as brotli_compress
+except ImportError:
+    brotli_compress = None
+
+__all__ = ("compression",)
+
+STREAM_ENCODINGS = {"gzip": web.ContentCoding.gzip, "deflate": web.ContentCoding.deflate}
+SKIPPED_STATUSES = (204, 206, 304)
+
+
+def compress_body(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli_compress(body, quality=min(level, 11))
+    compressor = compressobj(level, DEFLATED, MAX_WBITS + 16 if encoding == "gzip" else MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+class Compression:
+    def __init__(self, min_size: int, types: List[str], level: int, offload_size: int,
+                 encodings: List[str]) -> None:
+        self.min_size = min_size
+        self.types = types
+        self.level = level
+        self.offload_size = offload_size
+        self.encodings = [encoding for encoding in encodings if encoding != "br" or brotli_compress is not None]
+        self.saved = 0
+
+    def __repr__(self) -> str:
+        return f"<Compression encodings={self.encodings}, min_size={self.min_size}>"
+
+    def compressible(self, content_type: str) -> bool:
+        return content_type.startswith("text/") and content_type != "text/event-stream" \
+            or content_type in self.types
+
+    def negotiate(self, request: web.Request, encodings: List[str]) -> Optional[str]:
+        accepted = accepted_encodings(request)
+        for encoding in encodings:
+            if encoding in accepted:
+                return encoding
+        return None
+
+    def _skip(self, request: web.Request, response: web.StreamResponse) -> bool:
+        return request.method == hdrs.METH_HEAD or response.status in SKIPPED_STATUSES \
+            or hdrs.CONTENT_ENCODING in response.headers or not self.compressible(response.content_type)
+
+    async def apply(self, request: web.Request, response: web.StreamResponse) -> web.StreamResponse:
+        if not isinstance(response, web.Response) or response.prepared or not isinstance(response.body, bytes) \
+                or len(response.body) < self.min_size or self._skip(request, response):
+            return response
+
+        encoding = self.negotiate(request, self.encodings)
+        if encoding is None:
+            return response
+
+        body = response.body
+        if len(body) >= self.offload_size:
+            compressed = await request.app.executor.run(compress_body, body, encoding, self.level)
+        else:
+            compressed = compress_body(body, encoding, self.level)
+        if len(compressed) >= len(body):
+            return response
+
+        response.body = compressed
+        response.headers[hdrs.CONTENT_ENCODING] = encoding
+        if hdrs.ACCEPT_ENCODING.lower() not in response.headers.get(hdrs.VARY, "").lower():
+            response.headers.add(hdrs.VARY, hdrs.ACCEPT_ENCODING)
+        etag = response.headers.get(hdrs.ETAG)
+        if etag is not None and not etag.startswith("W/"):
+            response.headers[hdrs.ETAG] = "W/" + etag
+        self.saved += len(body) - len(compressed)
+        return response
+
+    def stream(self, request: web.Request, response: web.StreamResponse) -> None:
+        if self._skip(request, response):
+            return
+        encoding = self.negotiate(request, [encoding for encoding in self.encodings if encoding in STREAM_ENCODINGS])
+        if encoding is not None:
+            response.enable_compression(STREAM_ENCODINGS[encoding])
+
+
+def compression(min_size: Optional[int] = 1024, *, types: Optional[List[str]] = COMPRESSIBLE_TYPES,
+                level: Optional[int] = 6, offload_size: Optional[int] = 65536,
+                encodings: Optional[List[str]] = ("br", "gzip", "deflate")) -> "Compression":
+    """A function that returns a response compression policy.
+
+    :param min_size:        Responses with fewer bytes in the body are sent as
+                            they are, because compression does not pay off for
+                            them. Defaults to 1024.
+    :type min_size:         Optional[int]
+
+    :param types:           Content types that are compressed in addition to
+                            all "text/" types except event streams. Defaults to
+                            JSON, JavaScript, XML, WebAssembly and SVG.
+    :type types:            Optional[List[str]]
+
+    :param level:           The compression level, from 1 (fastest) to 9 (smallest),
+                            brotli uses the same number as its quality. Defaults to 6.
+    :type level:            Optional[int]
+
+    :param offload_size:    Bodies of this size and larger are compressed in the
+                            thread pool of the application so that the event loop
+                            is not blocked. Defaults to 65536.
+    :type offload_size:     Optional[int]
+
+    :param encodings:       Supported encodings in the order of preference, "br"
+                            is only used if the brotli library is installed and not
+                            for streams. Defaults to ("br", "gzip", "deflate").
+    :type encodings:        Optional[List[str]]
+
+    :return:                Response compression policy object.
+    :rtype:                 Compression
+    """
+
+    return Compression(min_size, types, level, offload_size, encodings)
@@ -0,0 +1,77 @@
+from aiohttp import web, hdrs
+from inspect import isawaitable
+from zlib import crc32
+from typing import Any, Optional
+
+try:
+    from xxhash import xxh3_64_intdigest
+except ImportError:
+    xxh3_64_intdigest = None
+
+__all__ = ("make_etag", "etag_matches", "not_modified", "conditional_handler")
+
+CONDITIONAL_METHODS = (hdrs.METH_GET, hdrs.METH_HEAD)
+PRESERVED_HEADERS = (hdrs.CACHE_CONTROL, hdrs.CONTENT_LOCATION, hdrs.EXPIRES, hdrs.VARY)
+
+
+def make_etag(body: bytes) -> str:
+    if xxh3_64_intdigest is not None:
+        return f'"{len(body):x}-{xxh3_64_intdigest(body):016x}"'
+    return f'"{len(body):x}-{crc32(body):08x}"'
+
+
+def etag_matches(request: web.Request, etag: str) -> bool:
+    header = request.headers.get(hdrs.IF_NONE_MATCH)
+    if header is None:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or "W/" + etag in tags
+
+
+def not_modified(request: web.Request, response: web.StreamResponse) -> Optional[web.Response]:
+    etag = response.headers.get(hdrs.ETAG)
+    if hdrs.IF_NONE_MATCH in request.headers:
+        if etag is None or not etag_matches(request, etag):
+            return None
+    else:
+        modified, since = response.last_modified, request.if_modified_since
+        if modified is None or since is None or modified > since:
+            return None
+
+    headers = {name: response.headers[name] for name in PRESERVED_HEADERS if name in response.headers}
+    if etag is not None:
+        headers[hdrs.ETAG] = etag
+    if hdrs.LAST_MODIFIED in response.headers:
+        headers[hdrs.LAST_MODIFIED] = response.headers[hdrs.LAST_MODIFIED]
+    return web.Response(status=304, headers=headers)
+
+
+def conditional(request: web.Request, response: web.StreamResponse) -> web.StreamResponse:
+    if request.method not in CONDITIONAL_METHODS or response.status != 200 or response.prepared \
+            or not isinstance(response, web.Response) or not isinstance(response.body, bytes):
+        return response
+
+    if hdrs.ETAG not in response.headers:
+        response.headers[hdrs.ETAG] = make_etag(response.body)
+    return not_modified(request, response) or response
+
+
+def conditional_handler(handler: object, name: str, version: object) -> object:
+    async def inner(request: web.Request) -> Any:
+        if request.method not in CONDITIONAL_METHODS:
+            return await handler(request)
+
+        key = version(request)
+        if isawaitable(key):
+            key = await key
+        etag = make_etag(f"{name}:{key}".encode())
+        if etag_matches(request, etag):
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+
+        response = await handler(request)
+        if not isinstance(response, web.StreamResponse):
+            response = await response(request)
+        response.headers[hdrs.ETAG] = etag
+        return response
+
+    return inner
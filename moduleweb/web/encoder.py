@@ -0,0 +1,113 @@
+import json
+
+from attr import has, asdict as attrs_asdict
+from dataclasses import is_dataclass, asdict
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+from typing import Optional, Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+__all__ = ("Encoder", "BACKENDS")
+
+
+def _json(data: Any, default: object) -> bytes:
+    return json.dumps(data, default=default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _orjson(data: Any, default: object) -> bytes:
+    try:
+        return orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return _json(data, default)
+
+
+def _ujson(data: Any, default: object) -> bytes:
+    try:
+        return ujson.dumps(data, default=default, ensure_ascii=False).encode()
+    except (OverflowError, TypeError):
+        return _json(data, default)
+
+
+BACKENDS = {"json": _json}
+BUILTIN_TYPES = (str, int, float, dict, list, tuple)
+ORJSON_NATIVE_TYPES = (UUID, Enum)
+DECODERS = {"json": json.loads}
+if ujson is not None:
+    BACKENDS["ujson"] = _ujson
+    DECODERS["ujson"] = ujson.loads
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | \
+        orjson.OPT_PASSTHROUGH_SUBCLASS | orjson.OPT_NON_STR_KEYS
+    BACKENDS["orjson"] = _orjson
+    DECODERS["orjson"] = orjson.loads
+
+PREFERENCE = ("orjson", "ujson", "json")
+
+
+def _isoformat(value: Union[date, time]) -> str:
+    return value.isoformat()
+
+
+class Encoder:
+    def __init__(self, backend: Optional[Union[str, object]] = None) -> None:
+        if backend is None:
+            backend = next(name for name in PREFERENCE if name in BACKENDS)
+        if isinstance(backend, str):
+            assert backend in BACKENDS, \
+                f"The JSON backend '{backend}' is not installed!"
+            self.name, self.backend = backend, BACKENDS[backend]
+        else:
+            self.name, self.backend = getattr(backend, "__name__", "custom"), backend
+        self.decoder = DECODERS.get(self.name) or DECODERS[next(name for name in PREFERENCE if name in DECODERS)]
+
+        self.hooks = {
+            datetime: _isoformat,
+            date: _isoformat,
+            time: _isoformat,
+            Decimal: str,
+            UUID: str,
+            set: list,
+            frozenset: list
+        }
+
+    def __repr__(self) -> str:
+        return f"<Encoder backend='{self.name}'>"
+
+    def hook(self, type: type) -> object:
+        def inner(handler: object) -> object:
+            self.hooks[type] = handler
+            if self.backend is BACKENDS.get("orjson") and issubclass(type, ORJSON_NATIVE_TYPES):
+                self.backend = _json
+            return handler
+
+        return inner
+
+    def default(self, value: Any) -> Any:
+        for cls in type(value).__mro__:
+            if cls in self.hooks:
+                return self.hooks[cls](value)
+        if is_dataclass(value):
+            return asdict(value)
+        if has(type(value)):
+            return attrs_asdict(value)
+        for cls in BUILTIN_TYPES:
+            if isinstance(value, cls):
+                return cls.__str__(value) if cls is str else (list if cls is tuple else cls)(value)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def encode(self, data: Any) -> bytes:
+        return self.backend(data, self.default)
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        return self.decoder(data)
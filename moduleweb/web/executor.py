@@ -0,0 +1,88 @@
+from aiohttp import web
+from asyncio import get_running_loop, iscoroutinefunction, wrap_future
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextvars import copy_context
+from functools import update_wrapper
+from inspect import isawaitable, isclass
+from os import cpu_count
+from threading import Lock
+from typing import Optional, Dict, Any
+
+__all__ = ("ThreadPool", "compile_handler")
+
+
+class ThreadPool:
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers or min(32, (cpu_count() or 1) + 4)
+        self.pending = 0
+        self.active = 0
+        self.completed = 0
+        self._executor = None
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return f"<ThreadPool max_workers={self.max_workers}, active={self.active}, pending={self.pending}>"
+
+    @property
+    def saturation(self) -> float:
+        return self.active / self.max_workers
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "active": self.active,
+            "pending": self.pending,
+            "completed": self.completed,
+            "saturation": self.saturation
+        }
+
+    def _call(self, function: object, *args: Any) -> Any:
+        with self._lock:
+            self.pending -= 1
+            self.active += 1
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def _forget(self, future: Future) -> None:
+        if future.cancelled():
+            with self._lock:
+                self.pending -= 1
+
+    async def run(self, function: object, *args: Any) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="moduleweb")
+
+        with self._lock:
+            self.pending += 1
+        future = self._executor.submit(copy_context().run, self._call, function, *args)
+        future.add_done_callback(self._forget)
+        return await wrap_future(future, loop=get_running_loop())
+
+    async def close(self, *_) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def compile_handler(handler: object, run_inline: Optional[bool] = False) -> object:
+    if iscoroutinefunction(handler) or isclass(handler):
+        return handler
+
+    if run_inline:
+        async def inner(request: web.Request, *args: Any) -> Any:
+            result = handler(request, *args)
+            if isawaitable(result):
+                result = await result
+            return result
+    else:
+        async def inner(request: web.Request, *args: Any) -> Any:
+            result = await request.app.executor.run(handler, request, *args)
+            if isawaitable(result):
+                result = await result
+            return result
+
+    return update_wrapper(inner, handler)
@@ -0,0 +1,27 @@
+from aiohttp import web
+from typing import Optional
+
+from .router import Router
+from .response import text
+
+__all__ = ("metrics",)
+
+
+def metrics(uri: Optional[str] = "/metrics") -> "Router":
+    """A function that returns a router exporting the application metrics.
+
+    :param uri:    The path at which the metrics collected in `app.metrics` are
+                   available in the Prometheus text format. Defaults to "/metrics".
+    :type uri:     Optional[str]
+
+    :return:       Router with a single route, which is registered with `App.add`.
+    :rtype:        Router
+    """
+
+    router = Router()
+
+    @router.get(uri)
+    async def export(request: web.Request) -> "Text":
+        return text(request.app.metrics.render(), content_type="text/plain; version=0.0.4")
+
+    return router
@@ -0,0 +1,128 @@
+from attr import dataclass
+from aiohttp import web, hdrs
+from asyncio import sleep, create_task, CancelledError
+from collections import OrderedDict
+from mimetypes import guess_type
+from os import stat
+from typing import Dict, Any, Optional
+
+from .conditional import make_etag, etag_matches
+
+__all__ = ("FileCache",)
+
+
+def read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+@dataclass(repr=False)
+class CachedFile:
+    body: bytes
+    content_type: str
+    etag: str
+    mtime: float
+    size: int
+
+    def __repr__(self) -> str:
+        return f"<CachedFile size={self.size}>"
+
+    def respond(self, request: web.Request, **kwargs: Any) -> web.Response:
+        headers = {hdrs.ETAG: self.etag, hdrs.ACCEPT_RANGES: "bytes", **kwargs.get("headers", {})}
+        if etag_matches(request, self.etag):
+            return web.Response(status=304, headers=headers)
+
+        status, body = kwargs.get("status", 200), memoryview(self.body)
+        if hdrs.RANGE in request.headers:
+            try:
+                start, stop, _ = request.http_range.indices(self.size)
+            except ValueError:
+                start, stop = self.size, self.size
+            if start >= stop:
+                headers[hdrs.CONTENT_RANGE] = f"bytes */{self.size}"
+                return web.Response(status=416, headers=headers)
+            headers[hdrs.CONTENT_RANGE] = f"bytes {start}-{stop - 1}/{self.size}"
+            status, body = 206, body[start:stop]
+
+        response = web.Response(body=body, status=status, headers=headers, content_type=self.content_type)
+        response.last_modified = self.mtime
+        return response
+
+
+class FileCache:
+    def __init__(self, max_size: Optional[int] = 67108864, max_file_size: Optional[int] = 1048576,
+                 poll_interval: Optional[float] = None) -> None:
+        self.max_size = max_size
+        self.max_file_size = max_file_size
+        self.poll_interval = poll_interval
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._files = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<FileCache files={len(self._files)}, size={self.size}>"
+
+    def stats(self) -> Dict[str, int]:
+        return {"files": len(self._files), "size": self.size, "hits": self.hits, "misses": self.misses}
+
+    def _evict(self, path: str) -> None:
+        cached = self._files.pop(path, None)
+        if cached is not None:
+            self.size -= cached.size
+
+    def _changed(self, path: str, cached: "CachedFile") -> bool:
+        try:
+            result = stat(path)
+        except OSError:
+            return True
+        return result.st_mtime != cached.mtime or result.st_size != cached.size
+
+    async def get(self, app: "App", path: str) -> Optional["CachedFile"]:
+        cached = self._files.get(path)
+        if cached is not None and (self.poll_interval or not self._changed(path, cached)):
+            self._files.move_to_end(path)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        self._evict(path)
+        try:
+            result = stat(path)
+        except OSError:
+            return None
+        if result.st_size > self.max_file_size:
+            return None
+
+        body = await app.executor.run(read_file, path)
+        cached = CachedFile(
+            body,
+            guess_type(path)[0] or "application/octet-stream",
+            make_etag(body),
+            result.st_mtime,
+            len(body)
+        )
+        self._files[path] = cached
+        self.size += cached.size
+        while self.size > self.max_size:
+            self._evict(next(iter(self._files)))
+        return cached
+
+    async def _poll(self) -> None:
+        while True:
+            await sleep(self.poll_interval)
+            for path, cached in list(self._files.items()):
+                if self._changed(path, cached):
+                    self._evict(path)
+
+    async def context(self, app: "App") -> None:
+        task = create_task(self._poll()) if self.poll_interval else None
+        yield
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except CancelledError:
+                pass
+        self._files.clear()
+        self.size = 0
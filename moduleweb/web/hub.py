@@ -0,0 +1,164 @@
+from aiohttp import web, WSMsgType, WSCloseCode
+from asyncio import Queue, QueueFull, create_task, gather, CancelledError
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List, Tuple, Set
+
+__all__ = ("Hub",)
+
+
+class Client:
+    def __init__(self, hub: "Hub", websocket: web.WebSocketResponse, queue_size: int) -> None:
+        self.hub = hub
+        self.websocket = websocket
+        self.channels = set()
+        self.queue = Queue(queue_size)
+        self.sent = 0
+        self._task = None
+        send_frame = getattr(websocket, "send_frame", None)
+        self._send = send_frame if send_frame is not None else self._send_message
+
+    def __repr__(self) -> str:
+        return f"<Client channels={len(self.channels)}, queued={self.queue.qsize()}>"
+
+    async def _send_message(self, payload: bytes, opcode: WSMsgType) -> None:
+        if opcode == WSMsgType.TEXT:
+            await self.websocket.send_str(payload.decode())
+        else:
+            await self.websocket.send_bytes(payload)
+
+    async def _run(self) -> None:
+        while True:
+            payload, opcode = await self.queue.get()
+            try:
+                await self._send(payload, opcode)
+            except (ConnectionError, RuntimeError):
+                self.hub.disconnect(self)
+                return
+            self.sent += 1
+
+    def start(self) -> None:
+        self._task = create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+
+    def subscribe(self, channel: str) -> None:
+        self.hub.subscribe(self, channel)
+
+    def unsubscribe(self, channel: str) -> None:
+        self.hub.unsubscribe(self, channel)
+
+
+class Hub:
+    def __init__(self, name: str, queue_size: Optional[int] = 64) -> None:
+        self.name = name
+        self.queue_size = queue_size
+        self.app = None
+        self.published = 0
+        self.dropped = 0
+        self._channels = {}
+        self._clients = set()
+
+    def __repr__(self) -> str:
+        return f"<Hub name='{self.name}', clients={len(self._clients)}, channels={len(self._channels)}>"
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "clients": len(self._clients),
+            "channels": len(self._channels),
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+    def subscribers(self, channel: str) -> int:
+        return len(self._channels.get(channel, ()))
+
+    def subscribe(self, client: "Client", channel: str) -> None:
+        self._channels.setdefault(channel, set()).add(client)
+        client.channels.add(channel)
+
+    def unsubscribe(self, client: "Client", channel: str) -> None:
+        subscribers = self._channels.get(channel)
+        if subscribers is not None:
+            subscribers.discard(client)
+            if not subscribers:
+                del self._channels[channel]
+        client.channels.discard(channel)
+
+    def disconnect(self, client: "Client") -> None:
+        for channel in list(client.channels):
+            self.unsubscribe(client, channel)
+        self._clients.discard(client)
+
+    @asynccontextmanager
+    async def connect(self, websocket: web.WebSocketResponse, channels: Optional[List[str]] = ()) -> "Client":
+        assert self.app is not None, \
+            f"The '{self.name}' hub cannot be used before its router is added to the application!"
+
+        client = Client(self, websocket, self.queue_size)
+        self._clients.add(client)
+        for channel in channels:
+            self.subscribe(client, channel)
+        client.start()
+        try:
+            yield client
+        finally:
+            self.disconnect(client)
+            await client.stop()
+
+    def encode(self, message: Any) -> Tuple[bytes, WSMsgType]:
+        if isinstance(message, str):
+            return message.encode(), WSMsgType.TEXT
+        if isinstance(message, (bytes, bytearray, memoryview)):
+            return bytes(message), WSMsgType.BINARY
+        return self.app.encoder.encode(message), WSMsgType.TEXT
+
+    def _drop(self, client: "Client") -> None:
+        self.dropped += 1
+        self.disconnect(client)
+        self.app.metrics.count("hub_dropped_clients", hub=self.name)
+        create_task(client.websocket.close(code=WSCloseCode.TRY_AGAIN_LATER, message=b"Too slow"))
+
+    def _deliver(self, clients: Set["Client"], message: Any) -> int:
+        if not clients:
+            return 0
+
+        frame, delivered, slow = self.encode(message), 0, []
+        for client in clients:
+            try:
+                client.queue.put_nowait(frame)
+                delivered += 1
+            except QueueFull:
+                slow.append(client)
+        for client in slow:
+            self._drop(client)
+
+        self.published += 1
+        return delivered
+
+    def publish(self, channel: str, message: Any) -> int:
+        return self._deliver(self._channels.get(channel), message)
+
+    def broadcast(self, message: Any) -> int:
+        return self._deliver(self._clients, message)
+
+    async def close(self) -> None:
+        clients = list(self._clients)
+        for client in clients:
+            self.disconnect(client)
+        await gather(
+            *[client.websocket.close(code=WSCloseCode.GOING_AWAY, message=b"Server shutdown") for client in clients],
+            return_exceptions=True
+        )
+
+
+async def close_hubs(app: "App") -> None:
+    await gather(*[hub.close() for hub in app.hubs.values()])
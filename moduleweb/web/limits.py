@@ -0,0 +1,151 @@
+from aiohttp import web, hdrs
+from asyncio import Semaphore, wait_for, TimeoutError
+from collections import OrderedDict
+from math import ceil
+from time import monotonic
+from typing import Any, Optional, Tuple
+
+__all__ = ("limit", "MemoryBackend")
+
+
+class MemoryBackend:
+    def __init__(self, max_keys: Optional[int] = 65536) -> None:
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<MemoryBackend keys={len(self._buckets)}>"
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, rate: float, burst: float) -> Tuple[bool, float]:
+        now = monotonic()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+def client_address(request: web.Request) -> str:
+    return request.remote or ""
+
+
+class Limit:
+    def __init__(self, rate: Optional[float], burst: Optional[float], key: object, concurrency: Optional[int],
+                 queue: int, timeout: Optional[float], backend: object, scope: Optional[str]) -> None:
+        self.rate = rate
+        self.burst = burst or max(1.0, rate or 0)
+        self.key = key
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+        self.backend = backend
+        self.scope = scope or f"limit-{id(self):x}"
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = None
+
+    def __repr__(self) -> str:
+        return f"<Limit rate={self.rate}, concurrency={self.concurrency}>"
+
+    def _reject(self, request: web.Request, name: str, status: int, reason: str,
+                retry_after: Optional[float] = None) -> web.Response:
+        request.app.metrics.count("rejected_requests", route=name, reason=reason)
+        headers = {hdrs.RETRY_AFTER: str(max(1, ceil(retry_after)))} if retry_after is not None else None
+        return web.Response(status=status, headers=headers)
+
+    async def _acquire(self) -> bool:
+        if self._semaphore is None:
+            self._semaphore = Semaphore(self.concurrency)
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return True
+        if self.waiting >= self.queue:
+            return False
+
+        self.waiting += 1
+        try:
+            await wait_for(self._semaphore.acquire(), self.timeout)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+
+    def wrap(self, handler: object, name: str) -> object:
+        async def inner(request: web.Request) -> Any:
+            if self.rate:
+                allowed, retry_after = await self.backend.take(f"{self.scope}:{self.key(request)}",
+                                                               self.rate, self.burst)
+                if not allowed:
+                    return self._reject(request, name, 429, "rate", retry_after)
+
+            if not self.concurrency:
+                return await handler(request)
+            if not await self._acquire():
+                return self._reject(request, name, 503, "concurrency", self.timeout)
+
+            self.active += 1
+            try:
+                return await handler(request)
+            finally:
+                self.active -= 1
+                self._semaphore.release()
+
+        return inner
+
+
+def limit(rate: Optional[float] = None, *, burst: Optional[float] = None, key: Optional[object] = None,
+          concurrency: Optional[int] = None, queue: Optional[int] = 0, timeout: Optional[float] = None,
+          backend: Optional[object] = None, scope: Optional[str] = None) -> "Limit":
+    """A function that returns an admission control policy for routes or routers.
+
+    :param rate:           The number of requests per second allowed for every
+                           client, requests above it are answered with 429 and
+                           the Retry-After header. Defaults to None, no limit.
+    :type rate:            Optional[float]
+
+    :param burst:          The number of requests a client can make at once before
+                           the rate applies. Defaults to the rate, but at least 1.
+    :type burst:           Optional[float]
+
+    :param key:            A function that takes the request and returns the client
+                           key of the rate limit, for example an API token. Defaults
+                           to the remote address.
+    :type key:             Optional[object]
+
+    :param concurrency:    The number of requests handled at the same time, shared
+                           by all routes with this policy. Defaults to None, no limit.
+    :type concurrency:     Optional[int]
+
+    :param queue:          The number of requests that wait for a free slot when all
+                           of them are taken, the rest are answered with 503 at once.
+                           Defaults to 0.
+    :type queue:           Optional[int]
+
+    :param timeout:        The number of seconds a request waits in the queue before
+                           it is answered with 503. Defaults to None, no timeout.
+    :type timeout:         Optional[float]
+
+    :param backend:        The store of the rate limit buckets, any object with the
+                           `async take(key, rate, burst) -> (allowed, retry_after)`
+                           method, for example one shared by several servers. Defaults
+                           to a new `MemoryBackend`.
+    :type backend:         Optional[object]
+
+    :param scope:          The prefix of the keys in the backend, set it when the
+                           backend is shared by several processes. Defaults to a
+                           name unique to this policy.
+    :type scope:           Optional[str]
+
+    :return:               Admission control policy object.
+    :rtype:                Limit
+    """
+
+    return Limit(rate, burst, key or client_address, concurrency, queue, timeout, backend or MemoryBackend(), scope)
@@ -0,0 +1,123 @@
+from aiohttp import web
+from bisect import bisect_left
+from random import random
+from time import perf_counter
+from typing import Dict, Any, Optional, List, Tuple
+
+__all__ = ("Metrics", "Histogram", "instrument")
+
+TIMINGS = "moduleweb.timings"
+PHASES = ("middleware", "handler", "conversion", "write")
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    return ",".join(f'{name}="{escape(str(value))}"' for name, value in labels)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def __repr__(self) -> str:
+        return f"<Histogram count={self.count}>"
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines, total = [], 0
+        for bound, count in zip(BUCKETS + ("+Inf",), self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class Metrics:
+    def __init__(self, sample_rate: Optional[float] = 0.0) -> None:
+        self.sample_rate = sample_rate
+        self.histograms = {}
+        self.counters = {}
+        self.exporters = []
+
+    def __repr__(self) -> str:
+        return f"<Metrics sample_rate={self.sample_rate}, histograms={len(self.histograms)}>"
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random() < self.sample_rate
+
+    def exporter(self, handler: object) -> object:
+        self.exporters.append(handler)
+        return handler
+
+    def observe(self, module: str, route: str, phase: str, seconds: float) -> None:
+        labels = (("module", module), ("route", route), ("phase", phase))
+        histogram = self.histograms.get(labels)
+        if histogram is None:
+            histogram = self.histograms[labels] = Histogram()
+        histogram.observe(seconds)
+        for exporter in self.exporters:
+            exporter("request_phase_seconds", dict(labels), seconds)
+
+    def count(self, name: str, amount: Optional[int] = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + amount
+        for exporter in self.exporters:
+            exporter(name, labels, amount)
+
+    def _canonical(self, request: web.Request) -> str:
+        resource = request.match_info.route.resource
+        return resource.canonical if resource is not None else "<unmatched>"
+
+    def record(self, request: web.Request, timings: Dict[str, Any], start: float, chained: float,
+               converted: float, written: float) -> None:
+        module, route = timings.get("route") or ("", f"{request.method} {self._canonical(request)}")
+        handler = timings.get("handler", 0.0)
+        self.observe(module, route, "middleware", chained - start - handler)
+        self.observe(module, route, "handler", handler)
+        self.observe(module, route, "conversion", converted - chained)
+        self.observe(module, route, "write", written - converted)
+
+    def render(self) -> str:
+        lines = [
+            "# HELP moduleweb_request_phase_seconds Time spent in each phase of a request.",
+            "# TYPE moduleweb_request_phase_seconds histogram"
+        ]
+        for labels, histogram in sorted(self.histograms.items()):
+            lines += histogram.render("moduleweb_request_phase_seconds", format_labels(labels))
+
+        names = sorted({name for name, _ in self.counters})
+        for name in names:
+            lines.append(f"# TYPE moduleweb_{name}_total counter")
+            for (counter, labels), value in sorted(self.counters.items()):
+                if counter == name:
+                    lines.append(f"moduleweb_{name}_total{{{format_labels(labels)}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def instrument(handler: object, module: str, route: str) -> object:
+    async def inner(request: web.Request) -> Any:
+        timings = request.get(TIMINGS)
+        if timings is None:
+            return await handler(request)
+
+        timings["route"] = (module, route)
+        start = perf_counter()
+        try:
+            return await handler(request)
+        finally:
+            timings["handler"] = perf_counter() - start
+
+    return inner
@@ -1,16 +1,42 @@
 from attr import dataclass
+from aiohttp import web, hdrs, __version__ as aiohttp_version
+from asyncio import Lock
 from importlib import import_module
-from typing import Optional
+from typing import Optional, List, Any
 
-from .router import Router
+from .router import Router, WorkersMixin, HubsMixin, ResourcesMixin
+from .response import add_templates
+from .assets import add_assets
 
-__all__ = ("module",)
+__all__ = ("module", "redispatch", "check_redispatch")
+
+REDISPATCH_AIOHTTP = ((3, 8), (4, 0))
+
+
+def check_redispatch() -> None:
+    version = tuple(int(part) for part in aiohttp_version.split(".")[:2])
+    low, high = REDISPATCH_AIOHTTP
+    assert low <= version < high, \
+        f"Lazy modules and hot reload need aiohttp>={low[0]}.{low[1]},<{high[0]}.{high[1]}, " \
+        f"but {aiohttp_version} is installed!"
+
+
+async def redispatch(request: web.Request, dispatcher: web.UrlDispatcher) -> Any:
+    match_info = await dispatcher.resolve(request)
+    match_info.add_app(request.app)
+    match_info.freeze()
+    # aiohttp has no public way to route a request again, so the match info is
+    # replaced the way `Application._handle` sets it, see `check_redispatch`.
+    request._match_info = match_info
+    request._cache.pop("match_info", None)
+    return await match_info.handler(request)
 
 
 @dataclass(repr=False)
 class Module:
     module_path: str
     router_path: str
+    lazy: Optional[List[str]] = None
 
     def __repr__(self) -> str:
         """Method that outputs a description of the object.
@@ -44,6 +70,28 @@ class Module:
         assert self.router_path.count(":") == 1, \
             "The module cannot be registered because router_path is written incorrectly!"
 
+        if self.lazy:
+            check_redispatch()
+            mount = LazyMount(self, location)
+            for prefix in self.lazy:
+                assert prefix.startswith("/"), \
+                    "The module cannot be registered because a lazy prefix does not start with a slash!"
+                app.router.add_route(hdrs.METH_ANY, prefix + "{tail:.*}", mount.handle)
+            return
+
+        self.import_router(location).register(app, location + self.module_path + "/")
+
+    def import_router(self, location: str) -> "Router":
+        """Service method that imports the view of the module and returns its router.
+
+        :param location:    The path to the modular application instance relative
+                            to the startup file.
+        :type location:     str
+
+        :return:            The router stored in the view of the module.
+        :rtype:             Router
+        """
+
         view_path, router_name = self.router_path.split(":")
         view_location = location + f"{self.module_path}.{view_path}"
         view = import_module(view_location.replace("/", "."))
@@ -51,10 +99,44 @@ class Module:
 
         assert isinstance(router, Router), \
             "The module cannot be registered because the router was not found in the view!"
-        router.register(app, location + self.module_path + "/")
+        return router
+
 
+class LazyMount:
+    def __init__(self, module: "Module", location: str) -> None:
+        self.module = module
+        self.location = location
+        self.dispatcher = None
+        self._lock = None
 
-def module(module_path: str, router_path: Optional[str] = "view:router") -> "Module":
+    def __repr__(self) -> str:
+        return f"<LazyMount module_path='{self.module.module_path}', loaded={self.dispatcher is not None}>"
+
+    async def load(self, app: "App") -> web.UrlDispatcher:
+        if self._lock is None:
+            self._lock = Lock()
+
+        async with self._lock:
+            if self.dispatcher is None:
+                router = await app.executor.run(self.module.import_router, self.location)
+                dispatcher = web.UrlDispatcher()
+                router.mount(dispatcher, self.location + self.module.module_path + "/")
+                ResourcesMixin.register(router, app)
+                await app.resources.open(app)
+                WorkersMixin.register(router, app)
+                HubsMixin.register(router, app)
+                add_templates(app, dispatcher)
+                if app.production:
+                    await add_assets(app, dispatcher)
+                self.dispatcher = dispatcher
+        return self.dispatcher
+
+    async def handle(self, request: web.Request) -> Any:
+        return await redispatch(request, self.dispatcher or await self.load(request.app))
+
+
+def module(module_path: str, router_path: Optional[str] = "view:router", *,
+           lazy: Optional[List[str]] = None) -> "Module":
     """A function that returns an application module object.
 
     :param module_path:    The path to the imported application module
@@ -66,8 +148,15 @@ def module(module_path: str, router_path: Optional[str] = "view:router") -> "Mod
                            instance, separated by a colon. Defaults to "view:router".
     :type router_path:     Optional[str]
 
+    :param lazy:           URL prefixes served by the module. When they are passed,
+                           the view of the module is not imported when the module is
+                           added to the application, but on the first request to one
+                           of these prefixes. The middlewares of a lazy module only
+                           apply to its own routes. Defaults to None.
+    :type lazy:            Optional[List[str]]
+
     :return:               Application module object.
     :rtype:                Module
     """
 
-    return Module(module_path, router_path)
+    return Module(module_path, router_path, lazy)
@@ -2,6 +2,8 @@ from attr import dataclass
 from aiohttp import web
 from typing import Dict, Any, Optional, List
 
+from .assets import AssetResource
+
 __all__ = ("template", "preroute")
 
 
@@ -41,7 +43,7 @@ class Template:
 
         assert not self.name.startswith("/") and self.name, \
             "The template cannot be registered because name starts with a slash or is empty!"
-        router.add_static("/" + self.name, location + self.folder, **self.kwargs)
+        router.register_resource(AssetResource("/" + self.name, location + self.folder, **self.kwargs))
 
 
 def template(name: str, folder: Optional[str] = "template", **kwargs: Any) -> "Template":
@@ -60,6 +62,11 @@ def template(name: str, folder: Optional[str] = "template", **kwargs: Any) -> "T
                       a static resource, and the static resource is an object from
                       **aiohttp**, you can pass through `kwargs` those parameters that
                       would be passed when declaring a static route in **aiohttp**.
+                      In production mode, files up to `max_size` bytes (1 MiB by
+                      default) are read at startup together with their gzip and brotli
+                      variants, served from memory with strong ETags and also under
+                      hashed names returned by `asset_url` in templates, which are
+                      cached by browsers forever.
     :type kwargs:     Any
 
     :return:          Template option object.
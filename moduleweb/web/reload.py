@@ -0,0 +1,220 @@
+import sys
+
+from attr import dataclass
+from aiohttp import web, hdrs
+from aiohttp_jinja2 import get_env
+from asyncio import create_task, sleep, CancelledError
+from functools import partial
+from importlib import reload
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Any, Optional, List
+
+from .router import Router, WorkersMixin, HubsMixin
+from .response import template_loaders
+from .module import redispatch, check_redispatch
+
+__all__ = ("Registration", "Reloader")
+
+POLL_INTERVAL = 0.5
+
+
+@dataclass(repr=False)
+class Registration:
+    module: "Module"
+    location: str
+    resources: List[web.AbstractResource]
+    middlewares: List[object]
+
+    def __repr__(self) -> str:
+        return f"<Registration module='{self.module}'>"
+
+
+def scan(directory: Path) -> Dict[str, float]:
+    mtimes = {}
+    for path in directory.rglob("*.py"):
+        try:
+            mtimes[str(path)] = path.stat().st_mtime
+        except OSError:
+            pass
+    return mtimes
+
+
+class ReloadMount:
+    def __init__(self, module: "Module", location: str, router: "Router") -> None:
+        self.module = module
+        self.location = location
+        self.router = router
+        self.dispatcher = None
+        self.middlewares = []
+        self.prefixes = []
+        view_path, _ = module.router_path.split(":")
+        self.view_name = (location + f"{module.module_path}.{view_path}").replace("/", ".")
+        self.directory = Path(sys.modules[self.view_name].__file__).parent
+        self.mtimes = scan(self.directory)
+
+    def __repr__(self) -> str:
+        return f"<ReloadMount module_path='{self.module.module_path}'>"
+
+    def build(self, router: "Router") -> None:
+        dispatcher = web.UrlDispatcher()
+        if router.scoped:
+            router.mount(dispatcher, self.location + self.module.module_path + "/")
+            middlewares = []
+        else:
+            router.register_routes(dispatcher, self.location + self.module.module_path + "/")
+            middlewares = [middleware._prepare() for middleware in router.middlewares]
+        self.router, self.dispatcher, self.middlewares = router, dispatcher, middlewares
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler: object) -> Any:
+        for middleware in reversed(self.middlewares):
+            handler = partial(middleware, handler=handler)
+        return await handler(request)
+
+    async def handle(self, request: web.Request) -> Any:
+        return await redispatch(request, self.dispatcher)
+
+    def changed(self) -> List[str]:
+        mtimes = scan(self.directory)
+        changed = [path for path, mtime in mtimes.items() if self.mtimes.get(path) != mtime]
+        self.mtimes = mtimes
+        return changed
+
+    def import_router(self, changed: List[str]) -> "Router":
+        for name, view in list(sys.modules.items()):
+            if name != self.view_name and getattr(view, "__file__", None) in changed:
+                reload(view)
+        reload(sys.modules[self.view_name])
+        return self.module.import_router(self.location)
+
+    def _invalidate_templates(self, app: "App", dispatcher: web.UrlDispatcher) -> None:
+        environment = get_env(app)
+        if environment is None:
+            return
+
+        mapping = template_loaders(dispatcher)
+        for prefix in self.prefixes:
+            environment.loader.mapping.pop(prefix, None)
+        environment.loader.mapping.update(mapping)
+        if environment.cache is not None:
+            stale = set(self.prefixes) | set(mapping)
+            for key in list(environment.cache.keys()):
+                if key[1].split("/", 1)[0] in stale:
+                    del environment.cache[key]
+        self.prefixes = list(mapping)
+
+    async def _swap_extensions(self, app: "App", old: "Router", new: "Router") -> None:
+        for kind, *_ in old.workers:
+            app.tasks.workers.pop(kind, None)
+        WorkersMixin.register(new, app)
+
+        for hub in old.hubs:
+            if app.hubs.get(hub.name) is hub:
+                del app.hubs[hub.name]
+                await hub.close()
+        HubsMixin.register(new, app)
+
+        for resource in new.resources:
+            if resource.name not in app.resources.declared:
+                app.resources.declare(resource)
+        await app.resources.open(app)
+
+    async def reload(self, app: "App", changed: List[str]) -> float:
+        start = perf_counter()
+        router = await app.executor.run(self.import_router, changed)
+        old = self.router
+        self.build(router)
+        self._invalidate_templates(app, self.dispatcher)
+        await self._swap_extensions(app, old, router)
+        return (perf_counter() - start) * 1000
+
+
+class Reloader:
+    def __init__(self, app: "App", interval: Optional[float] = POLL_INTERVAL) -> None:
+        self.app = app
+        self.interval = interval
+        self.mounts = []
+        self.owners = {}
+        self.history = []
+        self._task = None
+
+    def __repr__(self) -> str:
+        return f"<Reloader mounts={len(self.mounts)}, reloads={len(self.history)}>"
+
+    def install(self) -> None:
+        check_redispatch()
+        app = self.app
+        for registration in reversed(app.registrations):
+            module = registration.module
+            if isinstance(module, Router) or module.lazy:
+                continue
+
+            mount = ReloadMount(module, registration.location, module.import_router(registration.location))
+            mount.build(mount.router)
+            mount.prefixes = list(template_loaders(mount.dispatcher))
+            for resource in registration.resources:
+                if isinstance(resource, web.StaticResource):
+                    continue
+                self.owners[resource] = mount
+                if all(route.method != hdrs.METH_ANY for route in resource):
+                    resource.add_route(hdrs.METH_ANY, mount.handle)
+
+            if not mount.router.scoped:
+                entries = [index for index, middleware in enumerate(app.middlewares)
+                           if middleware in registration.middlewares]
+                for index in reversed(entries[1:]):
+                    del app.middlewares[index]
+                if entries:
+                    app.middlewares[entries[0]] = mount.middleware
+                else:
+                    app.middlewares.append(mount.middleware)
+            self.mounts.insert(0, mount)
+
+        app.middlewares.append(self.middleware)
+        app.router.add_route(hdrs.METH_ANY, "/{tail:.*}", self.fallback)
+        app.on_startup.append(self.start)
+        app.on_shutdown.append(self.stop)
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler: object) -> Any:
+        mount = self.owners.get(request.match_info.route.resource)
+        if mount is not None:
+            return await mount.handle(request)
+        return await handler(request)
+
+    async def fallback(self, request: web.Request) -> Any:
+        for mount in self.mounts:
+            match_info = await mount.dispatcher.resolve(request)
+            if match_info.http_exception is None:
+                return await mount.handle(request)
+        raise web.HTTPNotFound()
+
+    async def poll(self) -> None:
+        while True:
+            await sleep(self.interval)
+            for mount in self.mounts:
+                changed = await self.app.executor.run(mount.changed)
+                if not changed:
+                    continue
+
+                try:
+                    elapsed = await mount.reload(self.app, changed)
+                except Exception:
+                    self.app.logger.exception("Reloading the '%s' module failed", mount.module.module_path)
+                    continue
+                self.history.append((mount.module.module_path, elapsed))
+                self.app.logger.info("Reloaded the '%s' module in %.1f ms (%d changed files)",
+                                     mount.module.module_path, elapsed, len(changed))
+
+    async def start(self, app: "App") -> None:
+        self._task = create_task(self.poll())
+
+    async def stop(self, app: "App") -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,160 @@
+from attr import dataclass
+from aiohttp import web
+from asyncio import Lock, gather
+from inspect import isasyncgenfunction, isawaitable
+from time import perf_counter
+from typing import Dict, Any, Optional, List
+
+from .body import BODY
+from .timeouts import DEADLINE
+
+__all__ = ("Resources", "inject_resources")
+
+RESERVED_NAMES = (BODY, DEADLINE)
+RESERVED_PREFIX = "moduleweb."
+
+
+async def resolve(value: Any) -> Any:
+    return await value if isawaitable(value) else value
+
+
+@dataclass(repr=False)
+class Resource:
+    name: str
+    factory: object
+    close: Optional[object] = None
+    stats: Optional[object] = None
+
+    def __repr__(self) -> str:
+        return f"<Resource name='{self.name}'>"
+
+
+class Usage:
+    __slots__ = ("uses", "active", "peak", "created_ms")
+
+    def __init__(self, created_ms: float) -> None:
+        self.uses = 0
+        self.active = 0
+        self.peak = 0
+        self.created_ms = created_ms
+
+    def __repr__(self) -> str:
+        return f"<Usage uses={self.uses}, active={self.active}>"
+
+
+class Resources:
+    def __init__(self) -> None:
+        self.declared = {}
+        self.values = {}
+        self.usage = {}
+        self._contexts = {}
+        self._lock = None
+
+    def __repr__(self) -> str:
+        return f"<Resources declared={len(self.declared)}, created={len(self.values)}>"
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.values
+
+    def __getitem__(self, name: str) -> Any:
+        assert name in self.values, \
+            f"The '{name}' resource is not declared or not created yet!"
+        return self.values[name]
+
+    def declare(self, resource: "Resource") -> None:
+        assert resource.name not in RESERVED_NAMES and not resource.name.startswith(RESERVED_PREFIX), \
+            f"The '{resource.name}' name is reserved for the request and can't be used by a resource!"
+        assert self.declared.get(resource.name, resource) is resource, \
+            f"The '{resource.name}' resource is already declared!"
+        self.declared[resource.name] = resource
+
+    def acquire(self, name: str) -> Any:
+        value, usage = self[name], self.usage[name]
+        usage.uses += 1
+        usage.active += 1
+        if usage.active > usage.peak:
+            usage.peak = usage.active
+        return value
+
+    def release(self, name: str) -> None:
+        self.usage[name].active -= 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = {}
+        for name, usage in self.usage.items():
+            resource = self.declared[name]
+            stats[name] = {
+                "created_ms": usage.created_ms,
+                "uses": usage.uses,
+                "active": usage.active,
+                "peak": usage.peak,
+                **(resource.stats(self.values[name]) if resource.stats is not None else {})
+            }
+        return stats
+
+    async def _create(self, app: "App", resource: "Resource") -> None:
+        start = perf_counter()
+        if isasyncgenfunction(resource.factory):
+            context = resource.factory(app)
+            value = await context.__anext__()
+            self._contexts[resource.name] = context
+        else:
+            value = await resolve(resource.factory(app))
+        self.values[resource.name] = value
+        self.usage[resource.name] = Usage((perf_counter() - start) * 1000)
+
+    async def _close(self, name: str) -> None:
+        value, resource = self.values.pop(name), self.declared[name]
+        self.usage.pop(name)
+        context = self._contexts.pop(name, None)
+        if context is not None:
+            try:
+                await context.__anext__()
+            except StopAsyncIteration:
+                return
+            raise RuntimeError(f"The factory of the '{name}' resource has more than one yield")
+        if resource.close is not None:
+            await resolve(resource.close(value))
+            return
+
+        close = getattr(value, "aclose", None) or getattr(value, "close", None)
+        if close is not None:
+            await resolve(close())
+
+    async def open(self, app: "App") -> None:
+        if self._lock is None:
+            self._lock = Lock()
+
+        async with self._lock:
+            pending = [resource for name, resource in self.declared.items() if name not in self.values]
+            results = await gather(*[self._create(app, resource) for resource in pending], return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                await self.close(app, [resource.name for resource in pending if resource.name in self.values])
+                for resource in pending:
+                    del self.declared[resource.name]
+                raise errors[0]
+            for resource in pending:
+                app.logger.info("Created the '%s' resource in %.3f ms",
+                                resource.name, self.usage[resource.name].created_ms)
+
+    async def close(self, app: "App", names: Optional[List[str]] = None) -> None:
+        names = list(self.values) if names is None else names
+        results = await gather(*[self._close(name) for name in names], return_exceptions=True)
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                app.logger.error("Closing the '%s' resource failed", name, exc_info=result)
+
+
+def inject_resources(handler: object, names: List[str]) -> object:
+    async def inner(request: web.Request) -> Any:
+        resources = request.app.resources
+        for name in names:
+            request[name] = resources.acquire(name)
+        try:
+            return await handler(request)
+        finally:
+            for name in names:
+                resources.release(name)
+
+    return inner
@@ -1,29 +1,86 @@
-from aiohttp import web
-from typing import Optional, Dict, Any
-from json import dumps
-from aiohttp_jinja2 import render_template_async, setup
-from asyncio import iscoroutinefunction, coroutine
-from jinja2 import FileSystemLoader, PrefixLoader
+from aiohttp import web, hdrs
+from asyncio import create_task, current_task, wait, sleep, get_running_loop, CancelledError
+from collections import OrderedDict
+from re import compile as compile_pattern
+from typing import Optional, Dict, Any, Union, Iterable, AsyncIterable, List
+from aiohttp_jinja2 import render_template_async, setup, get_env
+from jinja2 import FileSystemLoader, PrefixLoader, FileSystemBytecodeCache
+from time import perf_counter
 
-__all__ = ("text", "json", "render", "file", "redirect", "stream", "socket")
+from .executor import compile_handler
+from .timeouts import stream_within
+from .metrics import TIMINGS
+from .conditional import conditional
+
+__all__ = ("text", "json", "render", "file", "redirect", "stream", "json_stream", "sse", "socket")
+
+TEMPLATE_EXTENSIONS = ("html", "htm", "xml", "jinja", "jinja2", "j2")
+DISCONNECT_POLL = 1.0
+NEWLINE = compile_pattern(r"\r\n|\r|\n")
 
 
 class BaseResponse:
+    __slots__ = ("kwargs", "_cookies", "_headers")
+
     def __init__(self, **kwargs: Any) -> None:
         self.kwargs = kwargs
-        self.cookies = {}
-        self.headers = {}
+        self._cookies = None
+        self._headers = None
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        if self._cookies is None:
+            self._cookies = {}
+        return self._cookies
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        if self._headers is None:
+            self._headers = {}
+        return self._headers
 
     async def __call__(self, request: web.Request) -> web.StreamResponse:
         response = await self.convert(request)
-        for name, value in self.cookies.items():
-            response.cookies[name] = value
-        for name, value in self.headers.items():
-            response.headers[name] = value
+        if self._cookies:
+            for name, value in self._cookies.items():
+                response.cookies[name] = value
+        if self._headers:
+            response.headers.update(self._headers)
         return response
 
 
+class Const(BaseResponse):
+    __slots__ = ("response", "body", "status", "reason", "prebuilt")
+
+    def __init__(self, response: "BaseResponse") -> None:
+        super().__init__()
+        self.response = response
+        self.body = None
+        self.status = None
+        self.reason = None
+        self.prebuilt = None
+
+    def __repr__(self) -> str:
+        return f"<Const response={self.response!r}>"
+
+    async def convert(self, request: web.Request) -> web.StreamResponse:
+        return await self.response(request)
+
+    async def __call__(self, request: web.Request) -> web.StreamResponse:
+        if self.prebuilt is None:
+            response = await super().__call__(request)
+            assert isinstance(response, web.Response) and not response.cookies, \
+                "Only plain responses without cookies can be constant!"
+
+            self.body, self.status, self.reason = response.body, response.status, response.reason
+            self.prebuilt = {name: value for name, value in response.headers.items() if name != hdrs.CONTENT_LENGTH}
+            return response
+        return web.Response(body=self.body, status=self.status, reason=self.reason, headers=self.prebuilt)
+
+
 class Text(BaseResponse):
+    __slots__ = ("data", "content_type")
+
     def __init__(self, data: str, content_type: str, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.data = data
@@ -44,49 +101,103 @@ def text(data: str, *, content_type: Optional[str] = "text/plain", **kwargs: Any
     return Text(data, content_type, **kwargs)
 
 
-def json(data: dict, *, content_type: Optional[str] = "application/json", **kwargs: Any) -> "Text":
-    return Text(dumps(data), content_type, **kwargs)
+text.const = lambda *args, **kwargs: Const(text(*args, **kwargs))
 
 
-class Render(BaseResponse):
-    def __init__(self, entry_point: str, context: Dict[str, Any], **kwargs: Any) -> None:
+class Json(BaseResponse):
+    __slots__ = ("data", "content_type")
+
+    def __init__(self, data: Any, content_type: str, **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.entry_point = entry_point
-        self.context = context
+        self.data = data
+        self.content_type = content_type
 
     def __repr__(self) -> str:
-        return f"<Render entry_point='{self.entry_point}'>"
+        return f"<Json content_type='{self.content_type}'>"
 
     async def convert(self, request: web.Request) -> web.StreamResponse:
-        return await render_template_async(
-            self.entry_point,
-            request,
-            self.context,
+        return web.Response(
+            body=request.app.encoder.encode(self.data),
+            content_type=self.content_type,
             **self.kwargs
         )
 
 
-def render(entry_point: str, context: Optional[Dict[str, Any]] = {}, **kwargs: Any) -> "Render":
-    return Render(entry_point, context, **kwargs)
+def json(data: Any, *, content_type: Optional[str] = "application/json", **kwargs: Any) -> "Json":
+    return Json(data, content_type, **{"charset": "utf-8", **kwargs})
+
+
+json.const = lambda *args, **kwargs: Const(json(*args, **kwargs))
+
+
+class Render(BaseResponse):
+    __slots__ = ("entry_point", "context", "cache")
+
+    def __init__(self, entry_point: str, context: Dict[str, Any], cache: Optional["CachePolicy"],
+                 **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.entry_point = entry_point
+        self.context = context
+        self.cache = cache
+
+    def __repr__(self) -> str:
+        return f"<Render entry_point='{self.entry_point}'>"
+
+    async def convert(self, request: web.Request) -> web.StreamResponse:
+        if self.cache is None or not self.cache.cacheable(request):
+            return await render_template_async(
+                self.entry_point,
+                request,
+                self.context,
+                **self.kwargs
+            )
+
+        key = self.cache.make_key(request, self.entry_point)
+        entry = request.app.cache.get(key)
+        if entry is None:
+            response = await render_template_async(
+                self.entry_point,
+                request,
+                self.context,
+                **self.kwargs
+            )
+            entry = request.app.cache.put(key, response, self.cache, self.entry_point)
+            if entry is None:
+                return response
+        return entry.respond(request)
+
+
+def render(entry_point: str, context: Optional[Dict[str, Any]] = {}, *, cache: Optional["CachePolicy"] = None,
+           **kwargs: Any) -> "Render":
+    return Render(entry_point, context, cache, **kwargs)
 
 
 class File(BaseResponse):
-    def __init__(self, path: str, **kwargs: Any) -> None:
+    __slots__ = ("path", "cache")
+
+    def __init__(self, path: str, cache: bool, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.path = path
+        self.cache = cache
 
     def __repr__(self) -> str:
         return f"<File path='{self.path}'>"
 
-    async def convert(self, *_) -> web.StreamResponse:
+    async def convert(self, request: web.Request) -> web.StreamResponse:
+        if self.cache:
+            cached = await request.app.files.get(request.app, str(self.path))
+            if cached is not None:
+                return cached.respond(request, **self.kwargs)
         return web.FileResponse(self.path, **self.kwargs)
 
 
-def file(path: str, **kwargs: Any) -> "File":
-    return File(path, **kwargs)
+def file(path: str, *, cache: Optional[bool] = False, **kwargs: Any) -> "File":
+    return File(path, cache, **kwargs)
 
 
 class Redirect(BaseResponse):
+    __slots__ = ("uri",)
+
     def __init__(self, uri: str, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.uri = uri
@@ -102,33 +213,247 @@ def redirect(uri: str, **kwargs: Any) -> "Redirect":
     return Redirect(uri, **kwargs)
 
 
+redirect.const = lambda *args, **kwargs: Const(redirect(*args, **kwargs))
+
+
 class Stream(BaseResponse):
-    def __init__(self, handler: object, **kwargs: Any) -> None:
+    __slots__ = ("handler",)
+
+    def __init__(self, handler: object, run_inline: bool, **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.handler = handler
+        self.handler = compile_handler(handler, run_inline)
 
     def __repr__(self) -> str:
         return f"<Stream handler='{self.handler.__name__}'>"
 
     async def convert(self, request: web.Request) -> web.StreamResponse:
         response = web.StreamResponse(**self.kwargs)
+        if request.app.compression is not None:
+            request.app.compression.stream(request, response)
+        await response.prepare(request)
+        await stream_within(request, response, self.handler(request, response))
+
+        return response
+
+
+def stream(handler: object, *, run_inline: Optional[bool] = False, **kwargs: Any) -> "Stream":
+    return Stream(handler, run_inline, **kwargs)
+
+
+class JsonStream(BaseResponse):
+    __slots__ = ("items", "ndjson", "content_type", "buffer_size")
+
+    def __init__(self, items: Union[Iterable[Any], AsyncIterable[Any]], ndjson: bool,
+                 content_type: Optional[str], buffer_size: int, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.items = items
+        self.ndjson = ndjson
+        self.content_type = content_type or ("application/x-ndjson" if ndjson else "application/json")
+        self.buffer_size = buffer_size
+
+    def __repr__(self) -> str:
+        return f"<JsonStream content_type='{self.content_type}'>"
+
+    async def _iterate(self) -> AsyncIterable[Any]:
+        if hasattr(self.items, "__aiter__"):
+            async for item in self.items:
+                yield item
+        else:
+            for item in self.items:
+                yield item
+
+    async def convert(self, request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(**self.kwargs)
+        response.content_type = self.content_type
+        response.enable_chunked_encoding()
+        if request.app.compression is not None:
+            request.app.compression.stream(request, response)
+        await response.prepare(request)
+        await stream_within(request, response, self._write(request, response))
+
+        return response
+
+    async def _write(self, request: web.Request, response: web.StreamResponse) -> None:
+        encode = request.app.encoder.encode
+        chunks, size, delimiter = [], 0, b"" if self.ndjson else b"["
+        async for item in self._iterate():
+            data = encode(item)
+            chunks += (delimiter, data)
+            size += len(data)
+            delimiter = b"\n" if self.ndjson else b","
+            if size >= self.buffer_size:
+                await response.write(b"".join(chunks))
+                chunks, size = [], 0
+
+        if self.ndjson:
+            chunks.append(b"\n" if delimiter else b"")
+        else:
+            chunks.append(b"[]" if delimiter == b"[" else b"]")
+        await response.write(b"".join(chunks))
+        await response.write_eof()
+
+
+def json_stream(items: Union[Iterable[Any], AsyncIterable[Any]], *, ndjson: Optional[bool] = False,
+                content_type: Optional[str] = None, buffer_size: Optional[int] = 65536,
+                **kwargs: Any) -> "JsonStream":
+    return JsonStream(items, ndjson, content_type, buffer_size, **kwargs)
+
+
+class ServerEvent:
+    __slots__ = ("data", "event", "id", "retry")
+
+    def __init__(self, data: Any, *, event: Optional[str] = None, id: Optional[str] = None,
+                 retry: Optional[int] = None) -> None:
+        assert not any(NEWLINE.search(str(field)) for field in (event, id) if field is not None), \
+            "The event name and id can't contain line breaks!"
+        self.data = data
+        self.event = event
+        self.id = id
+        self.retry = retry
+
+    def __repr__(self) -> str:
+        return f"<ServerEvent event='{self.event}', id='{self.id}'>"
+
+    def encode(self, encoder: "Encoder") -> bytes:
+        data = self.data if isinstance(self.data, str) else encoder.encode(self.data).decode()
+        lines = [f"event: {self.event}"] if self.event is not None else []
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        if self.retry is not None:
+            lines.append(f"retry: {self.retry}")
+        lines += [f"data: {line}" for line in NEWLINE.split(data)]
+        return ("\n".join(lines) + "\n\n").encode()
+
+
+class ReplayBuffer:
+    __slots__ = ("size", "frames")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.frames = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"<ReplayBuffer frames={len(self.frames)}>"
+
+    def add(self, id: str, frame: bytes) -> None:
+        if id in self.frames:
+            return
+        self.frames[id] = frame
+        while len(self.frames) > self.size:
+            self.frames.popitem(last=False)
+
+    def since(self, id: str) -> List[bytes]:
+        frames = list(self.frames.items())
+        for position, (frame_id, _) in enumerate(frames):
+            if frame_id == id:
+                return [frame for _, frame in frames[position + 1:]]
+        return [frame for _, frame in frames]
+
+
+class EventStream(BaseResponse):
+    __slots__ = ("events", "channel", "heartbeat", "replay", "buffer_size")
+
+    def __init__(self, events: AsyncIterable[Any], channel: Optional[str], heartbeat: Optional[float],
+                 replay: int, buffer_size: int, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.events = events
+        self.channel = channel
+        self.heartbeat = heartbeat
+        self.replay = replay
+        self.buffer_size = buffer_size
+
+    def __repr__(self) -> str:
+        return f"<EventStream channel='{self.channel}'>"
+
+    def _buffer(self, app: "App") -> Optional["ReplayBuffer"]:
+        if self.channel is None or not self.replay:
+            return None
+        buffer = app.event_buffers.get(self.channel)
+        if buffer is None:
+            buffer = app.event_buffers[self.channel] = ReplayBuffer(self.replay)
+        return buffer
+
+    async def _wait(self, request: web.Request, response: web.StreamResponse, pending: "Task") -> None:
+        loop = get_running_loop()
+        idle = loop.time()
+        timeout = min(self.heartbeat or DISCONNECT_POLL, DISCONNECT_POLL)
+        while not pending.done():
+            await wait((pending,), timeout=timeout)
+            if request.transport is None or request.transport.is_closing():
+                raise ConnectionResetError("Client disconnected")
+            if self.heartbeat and not pending.done() and loop.time() - idle >= self.heartbeat:
+                await response.write(b": ping\n\n")
+                idle = loop.time()
+
+    async def convert(self, request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(**self.kwargs)
+        response.content_type = "text/event-stream"
+        response.headers[hdrs.CACHE_CONTROL] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
         await response.prepare(request)
 
-        if not iscoroutinefunction(self.handler):
-            self.handler = coroutine(self.handler)
-        await self.handler(request, response)
+        buffer = self._buffer(request.app)
+        last_id = request.headers.get("Last-Event-ID")
+        frames = buffer.since(last_id) if buffer is not None and last_id is not None else []
+        size = sum(map(len, frames))
+
+        encoder, iterator, pending = request.app.encoder, self.events.__aiter__(), None
+        try:
+            while True:
+                pending = pending or create_task(iterator.__anext__())
+                if frames and not pending.done():
+                    await sleep(0)
+                if frames and (not pending.done() or size >= self.buffer_size):
+                    await response.write(b"".join(frames))
+                    frames, size = [], 0
+                await self._wait(request, response, pending)
+
+                try:
+                    item = pending.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+
+                event = item if isinstance(item, ServerEvent) else ServerEvent(item)
+                frame = event.encode(encoder)
+                if buffer is not None and event.id is not None:
+                    buffer.add(str(event.id), frame)
+                frames.append(frame)
+                size += len(frame)
+
+            if frames:
+                await response.write(b"".join(frames))
+            await response.write_eof()
+        except ConnectionResetError:
+            pass
+        finally:
+            if pending is not None:
+                pending.cancel()
+                try:
+                    await pending
+                except (CancelledError, StopAsyncIteration, Exception):
+                    pass
+            if hasattr(iterator, "aclose"):
+                await iterator.aclose()
 
         return response
 
 
-def stream(handler: object, **kwargs: Any) -> "Stream":
-    return Stream(handler, **kwargs)
+def sse(events: AsyncIterable[Any], *, channel: Optional[str] = None, heartbeat: Optional[float] = 15,
+        replay: Optional[int] = 100, buffer_size: Optional[int] = 65536, **kwargs: Any) -> "EventStream":
+    return EventStream(events, channel, heartbeat, replay, buffer_size, **kwargs)
+
+
+sse.event = ServerEvent
 
 
 class WebSocket(BaseResponse):
-    def __init__(self, handler: object, **kwargs: Any) -> None:
+    __slots__ = ("handler",)
+
+    def __init__(self, handler: object, run_inline: bool, **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.handler = handler
+        self.handler = compile_handler(handler, run_inline)
 
     def __repr__(self) -> str:
         return f"<WebSocket handler='{self.handler.__name__}'>"
@@ -136,30 +461,91 @@ class WebSocket(BaseResponse):
     async def convert(self, request: web.Request) -> web.WebSocketResponse:
         websocket = web.WebSocketResponse(**self.kwargs)
         await websocket.prepare(request)
-
-        if not iscoroutinefunction(self.handler):
-            self.handler = coroutine(self.handler)
         await self.handler(request, websocket)
 
         return websocket
 
 
-def socket(handler: object, **kwargs: Any) -> "WebSocket":
-    return WebSocket(handler, **kwargs)
+def socket(handler: object, *, run_inline: Optional[bool] = False, **kwargs: Any) -> "WebSocket":
+    return WebSocket(handler, run_inline, **kwargs)
 
 
 @web.middleware
 async def response_processor(request: web.Request, handler: object) -> Any:
+    metrics = request.app.metrics
+    if not metrics.sample_rate or not metrics.sampled():
+        response = await handler(request)
+        if isinstance(response, BaseResponse):
+            response = await response(request)
+        if request.app.etags:
+            response = conditional(request, response)
+        if request.app.compression is not None:
+            response = await request.app.compression.apply(request, response)
+        return response
+
+    timings = request[TIMINGS] = {}
+    start = perf_counter()
     response = await handler(request)
+    chained = perf_counter()
     if isinstance(response, BaseResponse):
-        return await response(request)
+        response = await response(request)
+    if request.app.etags:
+        response = conditional(request, response)
+    if request.app.compression is not None:
+        response = await request.app.compression.apply(request, response)
+    converted = perf_counter()
+    # aiohttp serves every request in its own task and writes the response after the
+    # outer middlewares, so the write phase ends when that task is done.
+    current_task().add_done_callback(
+        lambda _: metrics.record(request, timings, start, chained, converted, perf_counter())
+    )
     return response
 
 
-async def render_setuper(app: "App") -> None:
+def precompile_templates(app: "App", environment: "Environment",
+                         directory_prefixes: Dict[str, "FileSystemLoader"]) -> None:
+    for prefix, directory in directory_prefixes.items():
+        start = perf_counter()
+        names = directory.list_templates()
+        templates = [name for name in names if name.rsplit(".", 1)[-1] in TEMPLATE_EXTENSIONS]
+        for name in templates:
+            environment.get_template(f"{prefix}/{name}")
+
+        elapsed = perf_counter() - start
+        app.template_stats[prefix] = {"templates": len(templates), "seconds": elapsed}
+        app.logger.info("Precompiled %d templates of '%s' in %.3f s", len(templates), prefix, elapsed)
+
+
+def template_loaders(router: web.UrlDispatcher) -> Dict[str, "FileSystemLoader"]:
     directory_prefixes = {}
-    for resource in app.router._resources:
+    for resource in router._resources:
         if isinstance(resource, web.StaticResource):
             directory = FileSystemLoader(resource._directory)
             directory_prefixes[resource._prefix[1:]] = directory
-    setup(app, loader=PrefixLoader(directory_prefixes), enable_async=True)
+    return directory_prefixes
+
+
+def add_templates(app: "App", router: web.UrlDispatcher) -> None:
+    directory_prefixes = template_loaders(router)
+    environment = get_env(app)
+    environment.loader.mapping.update(directory_prefixes)
+    if app.production:
+        precompile_templates(app, environment, directory_prefixes)
+
+
+async def render_setuper(app: "App") -> None:
+    directory_prefixes = template_loaders(app.router)
+
+    if not app.production:
+        setup(app, loader=PrefixLoader(directory_prefixes), enable_async=True)
+        return
+
+    environment = setup(
+        app,
+        loader=PrefixLoader(directory_prefixes),
+        enable_async=True,
+        auto_reload=False,
+        cache_size=-1,
+        bytecode_cache=FileSystemBytecodeCache(app.bytecode_cache) if app.bytecode_cache else FileSystemBytecodeCache()
+    )
+    precompile_templates(app, environment, directory_prefixes)
@@ -1,9 +1,15 @@
-from attr import dataclass
+from attr import dataclass, evolve
 from aiohttp import web, hdrs
-from asyncio import iscoroutinefunction, coroutine
 from typing import Dict, Any, Optional, List, Union
 
 from .options import Template, Preroute
+from .executor import compile_handler
+from .metrics import instrument
+from .coalesce import coalesce_handler
+from .conditional import conditional_handler
+from .hub import Hub
+from .resources import Resource, inject_resources
+from .timeouts import timeout_handler
 
 __all__ = ("Router",)
 
@@ -32,12 +38,20 @@ class Middleware:
                 raise
             return await self.handler(request)
 
-    def register(self, app: "App") -> None:
-        if not iscoroutinefunction(self.handler):
-            self.handler = coroutine(self.handler)
+    def _prepare(self) -> object:
+        self.handler = compile_handler(self.handler)
+        return getattr(self, self.type.lower())
+
+    def wrap(self, handler: object) -> object:
+        middleware = self._prepare()
+
+        async def inner(request: web.Request) -> Any:
+            return await middleware(request, handler)
+
+        return inner
 
-        middleware = getattr(self, self.type.lower())
-        app.middlewares.append(middleware)
+    def register(self, app: "App") -> None:
+        app.middlewares.append(self._prepare())
 
 
 class MiddlewaresMixin:
@@ -67,8 +81,36 @@ class Route:
     def __repr__(self) -> str:
         return f"<Route uri='{self.uri}', method='{self.method}'>"
 
-    def register(self, router: web.UrlDispatcher) -> None:
-        router.add_route(self.method, self.uri, self.handler, **self.kwargs)
+    def register(self, router: web.UrlDispatcher, middlewares: Optional[List["Middleware"]] = (),
+                 module: Optional[str] = "", limit: Optional["Limit"] = None,
+                 timeout: Optional[float] = None) -> None:
+        kwargs = dict(self.kwargs)
+        handler = compile_handler(self.handler, kwargs.pop("run_inline", False))
+        body = kwargs.pop("body", None)
+        if body is not None:
+            handler = body.wrap(handler)
+        resources = kwargs.pop("resources", None)
+        if resources:
+            handler = inject_resources(handler, list(resources))
+        policy = kwargs.pop("cache", None)
+        if policy is not None:
+            handler = policy.wrap(handler, self.uri)
+        coalesce = kwargs.pop("coalesce", False)
+        if coalesce:
+            handler = coalesce_handler(handler, f"{self.method} {self.uri}", coalesce)
+        version = kwargs.pop("etag", None)
+        if version is not None:
+            handler = conditional_handler(handler, f"{self.method} {self.uri}", version)
+        for policy in (kwargs.pop("limit", None), limit):
+            if policy is not None:
+                handler = policy.wrap(handler, f"{self.method} {self.uri}")
+        handler = instrument(handler, module, f"{self.method} {self.uri}")
+        for middleware in reversed(middlewares):
+            handler = middleware.wrap(handler)
+        timeout = kwargs.pop("timeout", timeout)
+        if timeout is not None:
+            handler = timeout_handler(handler, f"{self.method} {self.uri}", timeout)
+        router.add_route(self.method, self.uri, handler, **kwargs)
 
 
 class RoutesMixin:
@@ -79,6 +121,8 @@ class RoutesMixin:
 
         self._options = options
         self.routes = []
+        self.limit = None
+        self.timeout = None
 
     def route(self, uri: str, *, methods: Optional[List[str]] = [hdrs.METH_GET, hdrs.METH_POST],
               **kwargs: Any) -> object:
@@ -127,24 +171,90 @@ class RoutesMixin:
     def preroutes(self) -> List["Preroute"]:
         return self._find_options(Preroute)
 
-    def register(self, app: "App", location: str) -> None:
-        router = app.router
+    def register(self, app: "App", location: str, middlewares: Optional[List["Middleware"]] = ()) -> None:
+        self.register_routes(app.router, location, middlewares)
+
+    def register_routes(self, router: web.UrlDispatcher, location: str,
+                        middlewares: Optional[List["Middleware"]] = ()) -> None:
         for template in self.templates:
             template.register(router, location)
+        routes = [evolve(route) for route in self.routes]
         for preroute in self.preroutes:
-            preroute.parse(self.routes)
-        for route in self.routes:
-            route.register(router)
+            preroute.parse(routes)
+        for route in routes:
+            route.register(router, middlewares, location.rstrip("/"), self.limit, self.timeout)
+
+
+class WorkersMixin:
+    def __init__(self, *_) -> None:
+        self.workers = []
+
+    def worker(self, kind: str, *, batch: Optional[int] = None) -> object:
+        def inner(handler: object) -> object:
+            self.workers.append((kind, handler, batch))
+            return handler
+
+        return inner
+
+    def register(self, app: "App", *_) -> None:
+        for kind, handler, batch in self.workers:
+            app.tasks.register(kind, handler, batch)
+
+
+class HubsMixin:
+    def __init__(self, *_) -> None:
+        self.hubs = []
+
+    def hub(self, name: str, *, queue_size: Optional[int] = 64) -> "Hub":
+        hub = Hub(name, queue_size)
+        self.hubs.append(hub)
+        return hub
+
+    def register(self, app: "App", *_) -> None:
+        for hub in self.hubs:
+            assert app.hubs.get(hub.name, hub) is hub, \
+                f"The '{hub.name}' hub is already registered!"
+            hub.app = app
+            app.hubs[hub.name] = hub
+
+
+class ResourcesMixin:
+    def __init__(self, *_) -> None:
+        self.resources = []
+
+    def resource(self, name: str, *, close: Optional[object] = None, stats: Optional[object] = None) -> object:
+        def inner(factory: object) -> object:
+            self.resources.append(Resource(name, factory, close, stats))
+            return factory
+
+        return inner
+
+    def register(self, app: "App", *_) -> None:
+        for resource in self.resources:
+            app.resources.declare(resource)
 
 
-class BaseRouter(MiddlewaresMixin, RoutesMixin):
-    def __init__(self, options: Optional[List[Union["Template", "Preroute"]]] = []) -> None:
+class BaseRouter(MiddlewaresMixin, RoutesMixin, WorkersMixin, HubsMixin, ResourcesMixin):
+    def __init__(self, options: Optional[List[Union["Template", "Preroute"]]] = [], *,
+                 scoped: Optional[bool] = False, limit: Optional["Limit"] = None,
+                 timeout: Optional[float] = None) -> None:
         for base in BaseRouter.__bases__:
             base.__init__(self, options)
+        self.scoped = scoped
+        self.limit = limit
+        self.timeout = timeout
 
     def register(self, app: "App", location: str) -> None:
         for base in BaseRouter.__bases__:
-            base.register(self, app, location)
+            if not self.scoped:
+                base.register(self, app, location)
+            elif base is RoutesMixin:
+                RoutesMixin.register(self, app, location, self.middlewares)
+            elif base is not MiddlewaresMixin:
+                base.register(self, app, location)
+
+    def mount(self, router: web.UrlDispatcher, location: str) -> None:
+        self.register_routes(router, location, self.middlewares)
 
 
 class Router(BaseRouter):
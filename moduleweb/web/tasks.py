@@ -0,0 +1,141 @@
+from attr import dataclass
+from asyncio import Event, QueueFull, create_task, gather, wait_for, TimeoutError
+from heapq import heappush, heappop, heapify
+from inspect import iscoroutinefunction
+from itertools import count
+from typing import Dict, Any, Optional, List, Tuple
+
+__all__ = ("TaskQueue",)
+
+
+@dataclass(repr=False)
+class TaskWorker:
+    kind: str
+    handler: object
+    batch: Optional[int]
+
+    def __repr__(self) -> str:
+        return f"<TaskWorker kind='{self.kind}', batch={self.batch}>"
+
+    async def __call__(self, app: "App", payloads: List[Any]) -> None:
+        argument = payloads if self.batch else payloads[0]
+        if iscoroutinefunction(self.handler):
+            await self.handler(argument)
+        else:
+            await app.executor.run(self.handler, argument)
+
+
+class TaskQueue:
+    def __init__(self, max_size: Optional[int] = 1024, concurrency: Optional[int] = 4,
+                 drain_timeout: Optional[float] = 30) -> None:
+        self.max_size = max_size
+        self.concurrency = concurrency
+        self.drain_timeout = drain_timeout
+        self.workers = {}
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self._heap = []
+        self._order = count()
+        self._pushed = None
+        self._taken = None
+        self._consumers = []
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f"<TaskQueue pending={len(self._heap)}, active={self.active}>"
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._heap),
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+    def register(self, kind: str, handler: object, batch: Optional[int] = None) -> None:
+        assert kind not in self.workers, \
+            f"The worker of the '{kind}' tasks is already registered!"
+        self.workers[kind] = TaskWorker(kind, handler, batch)
+
+    def full(self) -> bool:
+        return len(self._heap) >= self.max_size
+
+    def _push(self, kind: str, payload: Any, priority: int) -> None:
+        assert kind in self.workers, \
+            f"The task cannot be queued because the worker of the '{kind}' tasks is not registered!"
+        assert self._pushed is not None and not self._closed, \
+            "The task cannot be queued because the application is not running!"
+        heappush(self._heap, (priority, next(self._order), kind, payload))
+        self._pushed.set()
+
+    async def put(self, kind: str, payload: Optional[Any] = None, *, priority: Optional[int] = 0) -> None:
+        while self._taken is not None and self.full() and not self._closed:
+            self._taken.clear()
+            await self._taken.wait()
+        self._push(kind, payload, priority)
+
+    def put_nowait(self, kind: str, payload: Optional[Any] = None, *, priority: Optional[int] = 0) -> None:
+        if self.full():
+            raise QueueFull()
+        self._push(kind, payload, priority)
+
+    def _take(self) -> Tuple[str, List[Any]]:
+        _, _, kind, payload = heappop(self._heap)
+        payloads = [payload]
+        batch = self.workers[kind].batch
+        if batch and batch > 1 and self._heap:
+            same = sorted(entry for entry in self._heap if entry[2] == kind)[:batch - 1]
+            if same:
+                taken = {entry[1] for entry in same}
+                self._heap = [entry for entry in self._heap if entry[1] not in taken]
+                heapify(self._heap)
+                payloads += [entry[3] for entry in same]
+        return kind, payloads
+
+    async def _consume(self, app: "App") -> None:
+        while True:
+            while not self._heap and not self._closed:
+                self._pushed.clear()
+                await self._pushed.wait()
+            if not self._heap:
+                return
+            kind, payloads = self._take()
+            self._taken.set()
+
+            self.active += 1
+            try:
+                await self.workers[kind](app, payloads)
+            except Exception:
+                self.failed += len(payloads)
+                app.metrics.count("tasks", len(payloads), kind=kind, status="failed")
+                app.logger.exception("Background task of the '%s' kind failed", kind)
+            else:
+                self.completed += len(payloads)
+                app.metrics.count("tasks", len(payloads), kind=kind, status="completed")
+            finally:
+                self.active -= 1
+
+    async def start(self, app: "App") -> None:
+        self._closed = False
+        self._pushed, self._taken = Event(), Event()
+        self._consumers = [create_task(self._consume(app)) for _ in range(self.concurrency)]
+
+    async def drain(self, app: "App") -> None:
+        self._closed = True
+        self._pushed.set()
+        self._taken.set()
+
+        consumers = gather(*self._consumers)
+        try:
+            await wait_for(consumers, self.drain_timeout)
+        except TimeoutError:
+            app.logger.warning(
+                "Background tasks were not finished in %s s, %d queued tasks are dropped",
+                self.drain_timeout, len(self._heap)
+            )
+            self._heap.clear()
+        self._consumers = []
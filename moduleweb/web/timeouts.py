@@ -0,0 +1,71 @@
+from aiohttp import web
+from asyncio import CancelledError, current_task, get_running_loop
+from typing import Any, Optional
+
+__all__ = ("Deadline", "timeout_handler", "breached")
+
+DEADLINE = "deadline"
+SCOPE = "moduleweb.deadline"
+
+
+class Deadline:
+    def __init__(self, when: float, name: str) -> None:
+        self.when = when
+        self.name = name
+        self.expired = False
+        self._task = None
+        self._timer = None
+
+    def __repr__(self) -> str:
+        return f"<Deadline name='{self.name}', when={self.when:.3f}, expired={self.expired}>"
+
+    def _expire(self) -> None:
+        self.expired = True
+        self._task.cancel()
+
+    async def __aenter__(self) -> "Deadline":
+        self._task = current_task()
+        self._timer = get_running_loop().call_at(self.when, self._expire)
+        return self
+
+    async def __aexit__(self, exc_type: Optional[type], *_) -> bool:
+        self._timer.cancel()
+        if not self.expired or exc_type is not CancelledError:
+            return False
+
+        uncancel = getattr(self._task, "uncancel", None)
+        if uncancel is not None:
+            uncancel()
+        return True
+
+
+def breached(request: web.Request, name: str) -> None:
+    request.app.metrics.count("deadline_breaches", route=name)
+
+
+def timeout_handler(handler: object, name: str, seconds: float) -> object:
+    async def inner(request: web.Request) -> Any:
+        deadline = request[SCOPE] = Deadline(get_running_loop().time() + seconds, name)
+        request[DEADLINE] = deadline.when
+        async with deadline:
+            return await handler(request)
+
+        breached(request, deadline.name)
+        return web.Response(status=504)
+
+    return inner
+
+
+async def stream_within(request: web.Request, response: web.StreamResponse, coroutine: Any) -> None:
+    scope = request.get(SCOPE)
+    if scope is None:
+        await coroutine
+        return
+
+    async with Deadline(scope.when, scope.name) as deadline:
+        await coroutine
+    if deadline.expired:
+        breached(request, deadline.name)
+        response.force_close()
+        if request.transport is not None:
+            request.transport.close()
@@ -0,0 +1,142 @@
+import os
+import signal
+
+from aiohttp import web
+from asyncio import sleep, create_task, CancelledError
+from multiprocessing import get_context
+from socket import create_server
+from time import time, sleep as block
+from typing import Dict, Any, Optional, List
+
+__all__ = ("Supervisor",)
+
+
+class Worker:
+    def __init__(self, index: int, process: "Process", heartbeat: "Synchronized") -> None:
+        self.index = index
+        self.process = process
+        self.heartbeat = heartbeat
+        self.started = time()
+
+    def __repr__(self) -> str:
+        return f"<Worker index={self.index}, pid={self.process.pid}>"
+
+    def healthy(self, timeout: Optional[float]) -> bool:
+        if not self.process.is_alive():
+            return False
+        return not timeout or time() - max(self.heartbeat.value, self.started) < timeout
+
+
+class Supervisor:
+    def __init__(self, app: "App", workers: int, health_timeout: Optional[float] = 30,
+                 **kwargs: Any) -> None:
+        assert hasattr(os, "fork"), \
+            "Several workers can only be started on systems that support fork!"
+
+        self.app = app
+        self.workers = workers
+        self.health_timeout = health_timeout
+        self.kwargs = kwargs
+        self.restarts = 0
+        self._context = get_context("fork")
+        self._pool = []
+        self._running = False
+        self._reload = False
+
+    def __repr__(self) -> str:
+        return f"<Supervisor workers={self.workers}, restarts={self.restarts}>"
+
+    def _bind(self) -> Dict[str, Any]:
+        kwargs = dict(self.kwargs)
+        if kwargs.get("reuse_port") or "sock" in kwargs or "path" in kwargs:
+            return kwargs
+
+        host = kwargs.pop("host", None) or "0.0.0.0"
+        port = kwargs.pop("port", None) or (8443 if kwargs.get("ssl_context") else 8080)
+        kwargs["sock"] = create_server((host, port), backlog=kwargs.get("backlog", 128))
+        return kwargs
+
+    def _serve(self, index: int, heartbeat: "Synchronized", kwargs: Dict[str, Any]) -> None:
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(signum, signal.SIG_DFL)
+
+        async def beat() -> None:
+            while True:
+                heartbeat.value = time()
+                await sleep(1)
+
+        async def beat_context(app: "App") -> None:
+            task = create_task(beat())
+            yield
+            task.cancel()
+            try:
+                await task
+            except CancelledError:
+                pass
+
+        self.app.worker = index
+        for hook in self.app.on_worker_start:
+            hook(self.app)
+        self.app.cleanup_ctx.append(beat_context)
+        web.run_app(self.app, print=print if index == 0 else None, **kwargs)
+
+    def _spawn(self, index: int, kwargs: Dict[str, Any]) -> "Worker":
+        heartbeat = self._context.Value("d", time(), lock=False)
+        process = self._context.Process(
+            target=self._serve,
+            args=(index, heartbeat, kwargs),
+            name=f"moduleweb-worker-{index}",
+            daemon=False
+        )
+        process.start()
+        return Worker(index, process, heartbeat)
+
+    def _stop(self, pool: List["Worker"], timeout: Optional[float] = None) -> None:
+        for worker in pool:
+            if worker.process.is_alive():
+                worker.process.terminate()
+        for worker in pool:
+            worker.process.join(timeout or self.kwargs.get("shutdown_timeout", 60))
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+
+    def _supervise(self, kwargs: Dict[str, Any]) -> None:
+        for position, worker in enumerate(self._pool):
+            if worker.healthy(self.health_timeout):
+                continue
+
+            self.app.logger.warning(
+                "Worker %d (pid %s) %s, restarting it",
+                worker.index, worker.process.pid, "stopped responding" if worker.process.is_alive() else "exited"
+            )
+            self._stop([worker], timeout=5)
+            self._pool[position] = self._spawn(worker.index, kwargs)
+            self.restarts += 1
+
+    def _on_signal(self, signum: int, *_) -> None:
+        if signum == signal.SIGHUP:
+            self._reload = True
+        else:
+            self._running = False
+
+    def run(self) -> None:
+        kwargs = self._bind()
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(signum, self._on_signal)
+
+        self._running = True
+        self._pool = [self._spawn(index, kwargs) for index in range(self.workers)]
+        try:
+            while self._running:
+                if self._reload:
+                    self._reload = False
+                    old, self._pool = self._pool, [self._spawn(index, kwargs) for index in range(self.workers)]
+                    self.app.logger.info("Gracefully restarting %d workers", self.workers)
+                    self._stop(old)
+                self._supervise(kwargs)
+                block(1)
+        finally:
+            self._stop(self._pool)
+            if "sock" in kwargs and "sock" not in self.kwargs:
+                kwargs["sock"].close()